@@ -49,6 +49,9 @@ def create_app():
 
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # Övre gräns för uppladdade importfiler
+    app.config["MAX_CONTENT_LENGTH"] = 20 * 1024 * 1024
+
     # --------------------------------------------------
     # PG8000 — auto reconnect
     # --------------------------------------------------
@@ -113,6 +116,12 @@ def create_app():
     app.register_blueprint(settings_bp)
     app.register_blueprint(stats_bp)
 
+    # --------------------------------------------------
+    # CLI-KOMMANDON (flask <kommando>)
+    # --------------------------------------------------
+    from app.commands import register_commands
+    register_commands(app)
+
     # --------------------------------------------------
     # CREATE TABLES LOCALLY (SQLite only)
     # --------------------------------------------------
@@ -120,4 +129,8 @@ def create_app():
         if "sqlite" in app.config["SQLALCHEMY_DATABASE_URI"]:
             db.create_all()
 
+            # Ordsökning: FTS5-tabell + triggers (Postgres får pg_trgm via migrering)
+            from app.services.search import ensure_sqlite_search
+            ensure_sqlite_search()
+
     return app
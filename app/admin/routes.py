@@ -1,11 +1,24 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, abort
+from flask import render_template, redirect, request, url_for, flash, abort
 from flask_login import current_user, login_required
+from sqlalchemy import func
 
 from app.extensions import db
-from app.models import Word, User, WordList
-from app.admin import admin_bp as bp
-
-admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+from app.models import Word, User
+from app.services.answers import invalidate_answer_index
+from app.services.deletion import delete_words
+from app.services.dictionary import invalidate_dictionary, sync_dictionary, word_key
+from app.services.exporter import export_response, stream_rows
+from app.services.listing import USER_SORTS, InvalidCursor, user_page, users_stmt
+from app.services.rollups import bump_list_word_count, bump_user_stats
+from app.services.review import (
+    approve_groups,
+    parse_group_keys,
+    pending_count,
+    reject_groups,
+    review_page,
+)
+from app.services.sampling import invalidate_samplers
+from app.admin import admin_bp
 
 
 # ------------------------------------------------------
@@ -20,7 +33,7 @@ def admin_required():
 
 
 # ------------------------------------------------------
-# Visa alla ord som INTE är globala
+# Granskningskö: ej globala ord, grupperade och sidvisade
 # ------------------------------------------------------
 
 @admin_bp.route("/review")
@@ -28,10 +41,52 @@ def admin_required():
 def review_words():
     admin_required()
 
-    # Hämta ord som inte är godkända
-    pending = Word.query.filter_by(is_global=False).all()
+    groups, next_cursor = review_page(request.args.get("after"))
+
+    return render_template(
+        "admin_review.html",
+        groups=groups,
+        next_cursor=next_cursor,
+        pending_total=pending_count(),
+    )
+
+
+# ------------------------------------------------------
+# Godkänn / neka markerade grupper (en sats per åtgärd)
+# ------------------------------------------------------
+
+@admin_bp.route("/review/approve", methods=["POST"])
+@login_required
+def approve_groups_bulk():
+    admin_required()
+
+    keys = parse_group_keys(request.form.getlist("group"))
+    approved = approve_groups(keys)
+    sync_dictionary(keys)
+    db.session.commit()
+    invalidate_dictionary()
+
+    flash(f"Godkände {approved} ord.", "success")
+    return redirect(url_for("admin.review_words", after=request.form.get("after") or None))
+
+
+@admin_bp.route("/review/reject", methods=["POST"])
+@login_required
+def reject_groups_bulk():
+    admin_required()
+
+    keys = parse_group_keys(request.form.getlist("group"))
+    removed, list_ids, user_ids = reject_groups(keys)
+    db.session.commit()
+
+    for user_id in user_ids:
+        invalidate_answer_index(user_id=user_id)
+        invalidate_samplers(user_id)
+    for list_id in list_ids:
+        invalidate_answer_index(list_id=list_id)
 
-    return render_template("admin_review.html", pending=pending)
+    flash(f"Nekade och tog bort {removed} ord.", "success")
+    return redirect(url_for("admin.review_words", after=request.form.get("after") or None))
 
 
 # ------------------------------------------------------
@@ -49,7 +104,10 @@ def approve_word(word_id):
         return redirect(url_for("admin.review_words"))
 
     w.is_global = True
+    db.session.flush()
+    sync_dictionary([tuple(word_key(w.id))])
     db.session.commit()
+    invalidate_dictionary()
 
     flash(f"Godkände '{w.original} = {w.translation}'.", "success")
     return redirect(url_for("admin.review_words"))
@@ -69,38 +127,71 @@ def reject_word(word_id):
         flash("Ordet hittades inte.", "error")
         return redirect(url_for("admin.review_words"))
 
-    # Alternativ 1: Ta bort ordet
-    db.session.delete(w)
+    owner_id = w.word_list.user_id
+    list_id = w.list_id
+    original, translation = w.original, w.translation
+
+    # Alternativ 1: Ta bort ordet (och dess svarsloggar)
+    delete_words([w.id])
+    bump_list_word_count(list_id, -1)
+    if owner_id is not None:
+        bump_user_stats(owner_id, word_count=-1)
     db.session.commit()
+    invalidate_answer_index(user_id=owner_id, list_id=list_id)
+    invalidate_dictionary()
+    if owner_id is not None:
+        invalidate_samplers(owner_id)
 
-    flash(f"Nekade och tog bort '{w.original} = {w.translation}'.", "success")
+    flash(f"Nekade och tog bort '{original} = {translation}'.", "success")
     return redirect(url_for("admin.review_words"))
 
 
+# ------------------------------------------------------
+# Användaröversikt: en fråga per sida, sortering och sök
+# ------------------------------------------------------
+
+@admin_bp.errorhandler(InvalidCursor)
+def invalid_cursor(exc):
+    return str(exc), 400
+
+
+def _user_args():
+    sort = request.args.get("sort", "newest")
+    if sort not in USER_SORTS:
+        sort = "newest"
+    return sort, request.args.get("q", "").strip()[:100]
+
+
 @admin_bp.route("/users")
 @login_required
 def admin_users():
     admin_required()
 
-    users = User.query.all()
-    user_data = []
+    sort, q = _user_args()
+    users, next_cursor = user_page(sort, q, request.args.get("after"))
 
-    for u in users:
-        wordlist_count = WordList.query.filter_by(user_id=u.id).count()
+    return render_template(
+        "admin_users.html",
+        users=users,
+        next_cursor=next_cursor,
+        sort=sort,
+        q=q,
+        user_total=db.session.query(func.count(User.id)).scalar(),
+    )
 
-        created_attr = getattr(u, "created_at", None)
-        created_str = (
-            created_attr.strftime("%Y-%m-%d %H:%M") if created_attr else "—"
-        )
 
-        user_data.append(
-            {
-                "id": u.id,
-                "username": u.username,
-                "email": u.email,
-                "created_at": created_str,
-                "wordlist_count": wordlist_count,
-            }
-        )
+@admin_bp.route("/users/export")
+@login_required
+def export_users():
+    """Samma vy (sök och sortering) som CSV, strömmad rad för rad."""
+    admin_required()
+
+    sort, q = _user_args()
+    col, descending, _ = USER_SORTS[sort]
+    stmt = users_stmt(q).order_by(
+        col.desc().nulls_last() if descending else col.asc().nulls_last(),
+        User.id.desc() if descending else User.id.asc(),
+    )
 
-    return render_template("admin_users.html", users=user_data)
+    columns = ["id", "username", "email", "lists", "words", "quizzes", "last_active"]
+    return export_response(columns, stream_rows(stmt), "csv", "anvandare", gzip=request.args.get("gzip") == "1")
@@ -7,7 +7,7 @@ from flask_mail import Message
 from . import auth_bp
 from app import db
 from app.extensions import db, mail
-from app.models import User
+from app.models import User, UserStats
 from app.auth import auth_bp as bp
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
@@ -40,6 +40,10 @@ def register():
         user = User(username=username, email=email)
         user.set_password(password)
         db.session.add(user)
+        db.session.flush()
+
+        # Tom rollup-rad direkt, så att adminlistan har räknare för alla användare
+        db.session.add(UserStats(user_id=user.id))
         db.session.commit()
 
         flash("Registrering lyckades!", "success")
@@ -0,0 +1,83 @@
+import click
+
+from app.extensions import db
+from app.models import User, WordList
+
+
+def register_commands(app):
+    """Registrerar underhållskommandon, körs med `flask <kommando>`."""
+
+    @app.cli.command("rebuild-user-stats")
+    @click.option("--user-id", type=int, help="Bara en användare (annars alla).")
+    def rebuild_user_stats_command(user_id):
+        """Bygger om user_stats från ord, listor, resultat och svarsloggar."""
+        from app.services.rollups import rebuild_user_stats
+
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = [r[0] for r in db.session.query(User.id).order_by(User.id)]
+
+        for uid in user_ids:
+            rebuild_user_stats(uid)
+            db.session.commit()
+
+        click.echo(f"Byggde om statistik för {len(user_ids)} användare.")
+
+    @app.cli.command("backfill-daily-stats")
+    @click.option("--user-id", type=int, help="Bara en användare (annars alla).")
+    def backfill_daily_stats_command(user_id):
+        """Fyller daily_answer_stats från befintliga svarsloggar."""
+        from app.services.rollups import backfill_daily_stats
+
+        rows = backfill_daily_stats(user_id)
+        db.session.commit()
+
+        click.echo(f"Skrev {rows} dagsrader.")
+
+    @app.cli.command("reconcile-word-counts")
+    def reconcile_word_counts_command():
+        """Stämmer av word_list.word_count mot det faktiska antalet ord."""
+        from app.services.rollups import reconcile_word_counts
+
+        fixed = reconcile_word_counts()
+        db.session.commit()
+
+        click.echo(f"Rättade antal ord i {fixed} listor.")
+
+    @app.cli.command("rebuild-dictionary")
+    def rebuild_dictionary_command():
+        """Bygger om den kanoniska ordboken från alla godkända ord."""
+        from app.services.dictionary import rebuild_dictionary
+
+        entries = rebuild_dictionary()
+        db.session.commit()
+
+        click.echo(f"Ordboken har {entries} poster.")
+
+    @app.cli.command("import-words")
+    @click.argument("list_id", type=int)
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    def import_words_command(list_id, path):
+        """Importerar ord till en lista från en CSV-, TSV- eller XLSX-fil."""
+        from app.services.answers import invalidate_answer_index
+        from app.services.importer import ImportFileError, import_words, iter_word_rows
+        from app.services.sampling import invalidate_samplers
+
+        wl = db.session.get(WordList, list_id)
+        if wl is None:
+            raise click.ClickException(f"Listan {list_id} finns inte.")
+
+        with open(path, "rb") as f:
+            try:
+                added, skipped = import_words(wl, iter_word_rows(f, path))
+            except ImportFileError as exc:
+                db.session.rollback()
+                raise click.ClickException(str(exc))
+        db.session.commit()
+
+        if wl.user_id is not None:
+            invalidate_answer_index(wl.user_id)
+            invalidate_samplers(wl.user_id)
+
+        click.echo(f"Importerade {added} ord, hoppade över {skipped} dubbletter.")
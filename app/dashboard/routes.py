@@ -1,7 +1,14 @@
+from datetime import datetime
+
 from flask import Blueprint, render_template
 from flask_login import login_required, current_user
 
-from app.models import WordList, QuizResult
+from app.extensions import db
+from app.models import QuizResult
+from app.services.analytics import get_profile_stats
+from app.services.cache import conditional_render
+from app.services.rollups import get_user_stats
+from app.services.sampling import todays_word
 from app.dashboard import dashboard_bp as bp
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
@@ -11,52 +18,41 @@ dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/dashboard")
 @login_required
 def home():
     user = current_user
-    wordlists = WordList.query.filter_by(user_id=user.id).all()
-    results = (
-        QuizResult.query.filter_by(user_id=user.id)
-        .order_by(QuizResult.date.desc())
-        .limit(25)
-        .all()
-    )
+    stats = get_user_stats(user.id)
+    db.session.commit()
 
-    return render_template(
-        "dashboard.html",
-        username=user.username,
-        wordlists=wordlists,
-        results=results,
-    )
+    # Dagens datum (UTC, som streaken) i nyckeln: dagens ord byts vid midnatt
+    # och sidan ska då inte ge 304
+    today = datetime.utcnow().date()
+
+    def render():
+        results = (
+            QuizResult.query.filter_by(user_id=user.id)
+            .order_by(QuizResult.date.desc())
+            .limit(25)
+            .all()
+        )
+
+        return render_template(
+            "dashboard.html",
+            username=user.username,
+            stats=stats,
+            results=results,
+            todays_word=todays_word(user.id, today),
+        )
+
+    return conditional_render(f"dashboard-{user.id}-{stats.data_version}-{today.isoformat()}", render)
 
 
 @dashboard_bp.route("/profile")
 @login_required
 def profile():
     user = current_user
-    wordlists = WordList.query.filter_by(user_id=user.id).all()
-
-    total_words = sum(len(wl.words) for wl in wordlists)
-    total_lists = len(wordlists)
-
-    quizzes = QuizResult.query.filter_by(user_id=user.id).order_by(QuizResult.date).all()
-
-    hardest = []
-    for wl in wordlists:
-        for w in wl.words:
-            hardest.append({
-                "original": w.original,
-                "wrong_count": getattr(w, "wrong_count", 0),
-                "correct_count": getattr(w, "correct_count", 0),
-                "last_wrong": w.last_wrong.strftime("%d %b") if getattr(w, "last_wrong", None) else "–",
-            })
-
-    hardest.sort(key=lambda x: x["wrong_count"], reverse=True)
+    profile_stats = get_profile_stats(user.id)
+    db.session.commit()
 
     return render_template(
         "profile.html",
         user=user,
-        total_words=total_words,
-        total_lists=total_lists,
-        total_quizzes=len(quizzes),
-        quiz_labels=[q.date.strftime("%d %b") for q in quizzes],
-        quiz_scores=[q.correct_count for q in quizzes],
-        hardest_words=hardest,
+        **profile_stats,
     )
@@ -1,18 +1,146 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models import WordList, Word
+from app.services.answers import invalidate_answer_index
+from app.services.batch import MAX_OPS, apply_word_ops
+from app.services.deletion import delete_list as delete_list_rows, delete_words
+from app.services.dictionary import get_dictionary_index, global_keys, sync_dictionary
+from app.services.exporter import FORMATS, export_response, word_rows
+from app.services.importer import ImportFileError, import_words, iter_word_rows
+from app.services.listing import LIST_SORTS, WORD_SORTS, InvalidCursor, list_page, word_page
+from app.services.rollups import bump_list_word_count, bump_user_stats
+from app.services.sampling import invalidate_samplers
+from app.services.search import search_words
+from app.services.sharing import copy_list, get_share, import_shared_list, share_list as share_with, shared_lists
 
 lists_bp = Blueprint('lists', __name__, url_prefix="/lists")
 
+
+@lists_bp.errorhandler(InvalidCursor)
+def invalid_cursor(exc):
+    """Trasig eller manipulerad ?after=-markör: 400 i stället för ett databasfel."""
+    return str(exc), 400
+
+
+def _list_args(sorts, default):
+    """Sortering och textfilter från querysträngen."""
+    sort = request.args.get("sort", default)
+    if sort not in sorts:
+        sort = default
+    return sort, request.args.get("q", "").strip()[:100]
+
+
 # ---------------------------------------------
 # VIEW ALL LISTS
 # ---------------------------------------------
 @lists_bp.route("/")
 @login_required
 def view_all():
-    lists = WordList.query.filter_by(user_id=current_user.id).all()
-    return render_template("lists/view_all.html", lists=lists)
+    sort, q = _list_args(LIST_SORTS, "name_asc")
+    lists, next_cursor = list_page(current_user.id, sort, q, request.args.get("after"))
+    return render_template(
+        "lists/view_all.html",
+        lists=lists,
+        next_cursor=next_cursor,
+        sort=sort,
+        q=q,
+        shared=shared_lists(current_user.id),
+    )
+
+
+@lists_bp.route("/api/lists")
+@login_required
+def api_lists():
+    """Nästa sida listor som JSON (oändlig scroll), parametrar som view_all + after."""
+    sort, q = _list_args(LIST_SORTS, "name_asc")
+    lists, next_cursor = list_page(current_user.id, sort, q, request.args.get("after"))
+    return jsonify({
+        "lists": [
+            {
+                "id": l.id,
+                "name": l.name,
+                "word_count": l.word_count,
+                "url": url_for("lists.view_list", list_id=l.id),
+                "delete_url": url_for("lists.delete_list", list_id=l.id),
+            }
+            for l in lists
+        ],
+        "next": next_cursor,
+    })
+
+# ---------------------------------------------
+# SEARCH WORDS (alla listor)
+# ---------------------------------------------
+@lists_bp.route("/api/search")
+@login_required
+def api_search():
+    """Rankad ordsökning i alla användarens listor: q, limit (max 50), offset."""
+    q = request.args.get("q", "")
+    limit = min(max(request.args.get("limit", type=int, default=20), 1), 50)
+    offset = min(max(request.args.get("offset", type=int, default=0), 0), 1000)
+
+    results, has_more = search_words(current_user.id, q, limit=limit, offset=offset)
+    return jsonify({
+        "results": [
+            {
+                "id": r.id,
+                "original": r.original,
+                "translation": r.translation,
+                "list_id": r.list_id,
+                "list_name": r.list_name,
+                "url": url_for("lists.view_list", list_id=r.list_id, q=r.original),
+            }
+            for r in results
+        ],
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+    })
+
+# ---------------------------------------------
+# SUGGEST (ordboken, besvaras från minnet)
+# ---------------------------------------------
+@lists_bp.route("/api/suggest")
+@login_required
+def api_suggest():
+    """Översättningsförslag för add_word från den godkända ordboken: q, limit (max 20)."""
+    q = request.args.get("q", "")[:100]
+    limit = min(max(request.args.get("limit", type=int, default=8), 1), 20)
+
+    response = jsonify({"suggestions": get_dictionary_index().suggest(q, limit=limit)})
+    response.headers["Cache-Control"] = "private, max-age=60"
+    return response
+
+# ---------------------------------------------
+# EXPORT (alla listor eller en)
+# ---------------------------------------------
+def _export_args():
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        fmt = "csv"
+    return fmt, request.args.get("gzip") == "1"
+
+
+@lists_bp.route("/export")
+@login_required
+def export_lists():
+    fmt, gzip = _export_args()
+    columns, rows = word_rows(current_user.id)
+    return export_response(columns, rows, fmt, "ordlistor", gzip=gzip)
+
+
+@lists_bp.route("/<int:list_id>/export")
+@login_required
+def export_list(list_id):
+    wl = WordList.query.get_or_404(list_id)
+
+    if wl.user_id != current_user.id:
+        return redirect(url_for("lists.view_all"))
+
+    fmt, gzip = _export_args()
+    columns, rows = word_rows(current_user.id, list_id=wl.id)
+    return export_response(columns, rows, fmt, f"ordlista-{wl.id}", gzip=gzip)
 
 # ---------------------------------------------
 # CREATE LIST
@@ -29,6 +157,7 @@ def create_list():
 
         wl = WordList(name=name, user_id=current_user.id)
         db.session.add(wl)
+        bump_user_stats(current_user.id, list_count=1)
         db.session.commit()
 
         flash("Ordlista skapad!", "success")
@@ -46,8 +175,53 @@ def view_list(list_id):
     if wl.user_id != current_user.id:
         return redirect(url_for("lists.view_all"))
 
-    words = Word.query.filter_by(list_id=wl.id).all()
-    return render_template("lists/view_list.html", wordlist=wl, words=words)
+    sort, q = _list_args(WORD_SORTS, "alpha")
+    words, next_cursor = word_page(wl.id, sort, q, request.args.get("after"))
+    # Mållistor för "flytta markerade" i redigeringsläget
+    other_lists = (
+        db.session.query(WordList.id, WordList.name)
+        .filter(WordList.user_id == current_user.id, WordList.id != wl.id)
+        .order_by(WordList.name)
+        .all()
+    )
+
+    return render_template(
+        "lists/view_list.html",
+        wordlist=wl,
+        words=words,
+        next_cursor=next_cursor,
+        sort=sort,
+        q=q,
+        other_lists=other_lists,
+    )
+
+
+@lists_bp.route("/api/<int:list_id>/words")
+@login_required
+def api_list_words(list_id):
+    """Nästa sida ord i en lista som JSON, parametrar som view_list + after."""
+    wl = WordList.query.get_or_404(list_id)
+    if wl.user_id != current_user.id:
+        abort(403)
+
+    sort, q = _list_args(WORD_SORTS, "alpha")
+    words, next_cursor = word_page(wl.id, sort, q, request.args.get("after"))
+    return jsonify({
+        "words": [
+            {
+                "id": w.id,
+                "original": w.original,
+                "translation": w.translation,
+                "correct": w.correct_count or 0,
+                "wrong": w.wrong_count or 0,
+                "last_wrong": w.last_wrong.strftime("%Y-%m-%d") if w.last_wrong else None,
+                "edit_url": url_for("lists.edit_word", word_id=w.id),
+                "delete_url": url_for("lists.delete_word", word_id=w.id),
+            }
+            for w in words
+        ],
+        "next": next_cursor,
+    })
 
 # ---------------------------------------------
 # EDIT LIST NAME (GET + POST)
@@ -64,6 +238,7 @@ def edit_list(list_id):
         new_name = request.form.get("list_name")
         if new_name and len(new_name) >= 2:
             wl.name = new_name
+            bump_user_stats(current_user.id)
             db.session.commit()
             flash("Listnamnet har uppdaterats!", "success")
             return redirect(url_for("lists.view_list", list_id=list_id))
@@ -83,12 +258,104 @@ def delete_list(list_id):
     if wl.user_id != current_user.id:
         return redirect(url_for("lists.view_all"))
 
-    db.session.delete(wl)
+    word_count = wl.word_count
+    delete_list_rows(wl.id)
+    bump_user_stats(current_user.id, list_count=-1, word_count=-word_count)
     db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
     flash("Ordlista borttagen.", "success")
 
     return redirect(url_for("lists.view_all"))
 
+# ---------------------------------------------
+# SHARE / DUPLICATE LIST
+# ---------------------------------------------
+@lists_bp.route("/<int:list_id>/share", methods=["POST"])
+@login_required
+def share_list(list_id):
+    wl = WordList.query.get_or_404(list_id)
+
+    if wl.user_id != current_user.id:
+        return redirect(url_for("lists.view_all"))
+
+    share, error = share_with(wl, request.form.get("email"))
+    if error:
+        flash(error, "error")
+    else:
+        db.session.commit()
+        flash(f"Listan delades med {share.recipient.username}.", "success")
+
+    return redirect(url_for("lists.view_list", list_id=list_id))
+
+
+@lists_bp.route("/<int:list_id>/duplicate", methods=["POST"])
+@login_required
+def duplicate_list(list_id):
+    wl = WordList.query.get_or_404(list_id)
+
+    if wl.user_id != current_user.id:
+        return redirect(url_for("lists.view_all"))
+
+    copy, copied = copy_list(wl.id, current_user.id, f"Kopia av {wl.name}")
+    db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
+
+    flash(f"Listan kopierades ({copied} ord).", "success")
+    return redirect(url_for("lists.view_list", list_id=copy.id))
+
+# ---------------------------------------------
+# SHARED WITH ME (läses direkt från ägarens lista)
+# ---------------------------------------------
+@lists_bp.route("/shared/<int:share_id>")
+@login_required
+def view_shared(share_id):
+    share = get_share(share_id, current_user.id)
+    if share is None:
+        return redirect(url_for("lists.view_all"))
+
+    sort, q = _list_args(WORD_SORTS, "alpha")
+    words, next_cursor = word_page(share.list_id, sort, q, request.args.get("after"))
+    return render_template(
+        "lists/view_shared.html",
+        share=share,
+        wordlist=share.word_list,
+        words=words,
+        next_cursor=next_cursor,
+        sort=sort,
+        q=q,
+    )
+
+
+@lists_bp.route("/shared/<int:share_id>/copy", methods=["POST"])
+@login_required
+def import_shared(share_id):
+    """Skapar en egen, redigerbar kopia av en delad lista."""
+    share = get_share(share_id, current_user.id)
+    if share is None:
+        return redirect(url_for("lists.view_all"))
+
+    wl, copied = import_shared_list(share)
+    db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
+
+    flash(f"Listan sparades som din egen ({copied} ord).", "success")
+    return redirect(url_for("lists.view_list", list_id=wl.id))
+
+
+@lists_bp.route("/shared/<int:share_id>/remove", methods=["POST"])
+@login_required
+def remove_shared(share_id):
+    share = get_share(share_id, current_user.id)
+    if share is not None:
+        db.session.delete(share)
+        db.session.commit()
+        flash("Den delade listan togs bort.", "success")
+
+    return redirect(url_for("lists.view_all"))
+
 # ---------------------------------------------
 # ADD WORD
 # ---------------------------------------------
@@ -109,12 +376,78 @@ def add_word(list_id):
 
     word = Word(original=original, translation=translation, list_id=wl.id)
     db.session.add(word)
+    bump_list_word_count(wl.id, 1)
+    bump_user_stats(current_user.id, word_count=1)
     db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
 
     flash("Ord tillagt!", "success")
 
     return redirect(url_for("lists.view_list", list_id=list_id))
 
+# ---------------------------------------------
+# IMPORT WORDS (CSV / TSV / XLSX)
+# ---------------------------------------------
+@lists_bp.route("/<int:list_id>/import", methods=["POST"])
+@login_required
+def import_list_words(list_id):
+    wl = WordList.query.get_or_404(list_id)
+
+    if wl.user_id != current_user.id:
+        return redirect(url_for("lists.view_all"))
+
+    upload = request.files.get("file")
+    if not upload or not upload.filename:
+        flash("Välj en fil att importera.", "error")
+        return redirect(url_for("lists.view_list", list_id=list_id))
+
+    # Filen läses rad för rad direkt från uppladdningen
+    try:
+        added, skipped = import_words(wl, iter_word_rows(upload.stream, upload.filename))
+    except ImportFileError as exc:
+        db.session.rollback()
+        flash(str(exc), "error")
+        return redirect(url_for("lists.view_list", list_id=list_id))
+
+    db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
+
+    flash(f"{added} ord importerade, {skipped} dubbletter hoppades över.", "success")
+    return redirect(url_for("lists.view_list", list_id=list_id))
+
+# ---------------------------------------------
+# BATCH WORD OPERATIONS (JSON)
+# ---------------------------------------------
+@lists_bp.route("/api/<int:list_id>/batch", methods=["POST"])
+@login_required
+def api_batch(list_id):
+    """
+    Flera ändringar i en lista i en transaktion. Body:
+    {"ops": [{"op": "create", "original", "translation"},
+             {"op": "update", "id", "original"?, "translation"?},
+             {"op": "move", "id", "to_list"},
+             {"op": "delete", "id"}]}
+    """
+
+    wl = WordList.query.get_or_404(list_id)
+    if wl.user_id != current_user.id:
+        abort(403)
+
+    ops = (request.get_json(silent=True) or {}).get("ops")
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"error": "Inga ändringar skickades."}), 400
+    if len(ops) > MAX_OPS:
+        return jsonify({"error": f"Högst {MAX_OPS} ändringar åt gången."}), 400
+
+    results = apply_word_ops(wl, ops)
+    db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
+
+    return jsonify({"results": results, "word_count": wl.word_count})
+
 # ---------------------------------------------
 # EDIT WORD
 # ---------------------------------------------
@@ -128,9 +461,14 @@ def edit_word(word_id):
         return redirect(url_for("lists.view_all"))
 
     if request.method == "POST":
+        keys = global_keys(Word.id == w.id)
         w.original = request.form.get("original")
         w.translation = request.form.get("translation")
+        db.session.flush()
+        sync_dictionary(keys + global_keys(Word.id == w.id))
+        bump_user_stats(current_user.id)
         db.session.commit()
+        invalidate_answer_index(current_user.id)
         flash("Ordet uppdaterades!", "success")
         return redirect(url_for("lists.view_list", list_id=wl.id))
 
@@ -148,8 +486,12 @@ def delete_word(word_id):
     if wl.user_id != current_user.id:
         return redirect(url_for("lists.view_all"))
 
-    db.session.delete(w)
+    delete_words([w.id])
+    bump_list_word_count(wl.id, -1)
+    bump_user_stats(current_user.id, word_count=-1)
     db.session.commit()
+    invalidate_answer_index(current_user.id)
+    invalidate_samplers(current_user.id)
 
     flash("Ord borttaget.", "success")
     return redirect(url_for("lists.view_list", list_id=wl.id))
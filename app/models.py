@@ -43,11 +43,31 @@ class WordList(db.Model):
 
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
+    # Denormaliserat antal ord, hålls uppdaterat av alla skrivvägar
+    word_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # passive_deletes: raderna tas bort av databasen (ON DELETE CASCADE) eller
+    # av app/services/deletion.py, aldrig genom att ladda dem i sessionen
     words = db.relationship(
         'Word',
         backref='word_list',
         lazy=True,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    shares = db.relationship(
+        'ListShare',
+        backref='word_list',
+        lazy=True,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Sidvisning av användarens listor sorterade på namn eller antal ord
+        db.Index("ix_word_list_user_name", "user_id", "name"),
+        db.Index("ix_word_list_user_word_count", "user_id", "word_count"),
     )
 
 
@@ -63,7 +83,54 @@ class Word(db.Model):
 
     is_global = db.Column(db.Boolean, default=False)
 
-    list_id = db.Column(db.Integer, db.ForeignKey('word_list.id'), nullable=False)
+    # Repetitionsschema (SM-2), se app/services/scheduler.py
+    next_due = db.Column(db.DateTime, default=datetime.utcnow)
+    interval_days = db.Column(db.Float, default=0)
+    ease = db.Column(db.Float, default=2.5)
+    repetitions = db.Column(db.Integer, default=0)
+
+    list_id = db.Column(db.Integer, db.ForeignKey('word_list.id', ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        # Slumpning och sidvisning inom en lista går på (list_id, id)
+        db.Index("ix_word_list_id_id", "list_id", "id"),
+        # "Nästa N förfallna ord" i de valda listorna
+        db.Index("ix_word_list_id_next_due", "list_id", "next_due"),
+        # Top-K svåraste ord per användare
+        db.Index("ix_word_list_id_wrong_count", "list_id", "wrong_count"),
+        # Sidvisning av en lista i bokstavsordning eller efter senaste fel
+        db.Index("ix_word_list_id_original", "list_id", "original"),
+        db.Index("ix_word_list_id_last_wrong", "list_id", "last_wrong"),
+        # Granskningskön: ej godkända ord grupperade på normaliserad form
+        db.Index(
+            "ix_word_pending_norm",
+            db.text("lower(original)"),
+            db.text("lower(translation)"),
+            postgresql_where=db.text("is_global = false"),
+            sqlite_where=db.text("is_global = 0"),
+        ),
+    )
+
+
+class ListShare(db.Model):
+    """
+    En lista som delats med en annan användare. Mottagaren läser ägarens ord
+    direkt (ingen kopia); en egen kopia skapas först när mottagaren vill ändra.
+    """
+
+    __tablename__ = "list_share"
+
+    id = db.Column(db.Integer, primary_key=True)
+    list_id = db.Column(db.Integer, db.ForeignKey("word_list.id", ondelete="CASCADE"), nullable=False)
+    recipient_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    recipient = db.relationship("User", backref="shared_with_me", lazy=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("list_id", "recipient_id", name="uq_list_share_list_recipient"),
+        db.Index("ix_list_share_recipient", "recipient_id"),
+    )
 
 
 class QuizResult(db.Model):
@@ -75,6 +142,15 @@ class QuizResult(db.Model):
     total_questions = db.Column(db.Integer, nullable=False)
     date = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Klientens idempotensnyckel, så att samma förhör bara sparas en gång
+    client_key = db.Column(db.String(64), nullable=True)
+
+    __table_args__ = (
+        # Tidsserier per användare
+        db.Index("ix_quiz_result_user_date", "user_id", "date"),
+        db.UniqueConstraint("user_id", "client_key", name="uq_quiz_result_user_client_key"),
+    )
+
 
 class PublicWord(db.Model):
     __tablename__ = 'public_word'
@@ -85,6 +161,32 @@ class PublicWord(db.Model):
     level = db.Column(db.String(20), nullable=False)  # easy / medium / hard
 
 
+class DictionaryEntry(db.Model):
+    """
+    Kanonisk ordbok: ett par per godkänd (original, översättning), oavsett
+    hur många listor ordet finns i. Byggs från Word.is_global, se
+    app/services/dictionary.py.
+    """
+
+    __tablename__ = "dictionary_entry"
+
+    id = db.Column(db.Integer, primary_key=True)
+    original = db.Column(db.String(255), nullable=False)
+    translation = db.Column(db.String(255), nullable=False)
+
+    # lower() av original/translation, nyckel för dedup
+    norm_original = db.Column(db.String(255), nullable=False)
+    norm_translation = db.Column(db.String(255), nullable=False)
+
+    # Antal godkända ord med samma par, används för rankning
+    usage_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("norm_original", "norm_translation", name="uq_dictionary_entry_norm"),
+    )
+
+
 class QuizAnswerLog(db.Model):
     __tablename__ = "quiz_answer_log"
 
@@ -92,7 +194,7 @@ class QuizAnswerLog(db.Model):
 
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     quiz_result_id = db.Column(db.Integer, db.ForeignKey("quiz_result.id"), nullable=False)
-    word_id = db.Column(db.Integer, db.ForeignKey("word.id"), nullable=False)
+    word_id = db.Column(db.Integer, db.ForeignKey("word.id", ondelete="CASCADE"), nullable=False)
 
     user_answer = db.Column(db.String(255), nullable=False)
     is_correct = db.Column(db.Boolean, nullable=False)
@@ -101,4 +203,41 @@ class QuizAnswerLog(db.Model):
     # Relationer
     user = db.relationship("User", backref="answer_logs", lazy=True)
     quiz_result = db.relationship("QuizResult", backref="answer_logs", lazy=True)
-    word = db.relationship("Word", backref="answer_logs", lazy=True)
+    word = db.relationship("Word", backref=db.backref("answer_logs", passive_deletes=True), lazy=True)
+
+    __table_args__ = (
+        # Aggregering per ord för en användare (svåraste ord, ordstatistik)
+        db.Index("ix_quiz_answer_log_user_word", "user_id", "word_id"),
+    )
+
+
+class UserStats(db.Model):
+    """Sammanställd statistik per användare, uppdateras i samma transaktion som varje skrivning."""
+    __tablename__ = "user_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+
+    word_count = db.Column(db.Integer, nullable=False, default=0)
+    list_count = db.Column(db.Integer, nullable=False, default=0)
+    quiz_count = db.Column(db.Integer, nullable=False, default=0)
+    total_correct = db.Column(db.Integer, nullable=False, default=0)
+    total_wrong = db.Column(db.Integer, nullable=False, default=0)
+
+    # Dagsstreak: antal dagar i rad med minst ett förhör
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    best_streak = db.Column(db.Integer, nullable=False, default=0)
+    last_active_day = db.Column(db.Date)
+
+    # Räknas upp av varje skrivväg; nyckel för cachade sidor och ETags
+    data_version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyAnswerStat(db.Model):
+    """Antal rätt/fel svar per användare och dag (UTC), upsertas av quiz_finish."""
+    __tablename__ = "daily_answer_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    wrong = db.Column(db.Integer, nullable=False, default=0)
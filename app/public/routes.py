@@ -2,7 +2,7 @@ import random
 from flask import Blueprint, render_template, flash, url_for, redirect, current_app
 from itsdangerous import URLSafeTimedSerializer
 
-from app.models import Word
+from app.services.answers import clean, get_list_answer_index
 from app.public import public_bp
 
 public_bp = Blueprint("public", __name__)
@@ -48,33 +48,17 @@ def practice_level(level):
     list_id = LEVEL_MAP[key]["id"]
     label = LEVEL_MAP[key]["label"]
 
-    words = Word.query.filter_by(list_id=list_id).all()
-    if not words:
+    groups = get_list_answer_index(list_id).groups()
+    if not groups:
         flash("Inga ord i denna nivå.", "error")
         return redirect(url_for("public.landing"))
 
-    groups = {}
-    for w in words:
-        swe = (w.original or "").strip()
-        eng = (w.translation or "").strip()
-        if swe and eng:
-            groups.setdefault(swe, set()).add(eng)
-
     unique_questions = list(groups.keys())
     chosen = random.sample(unique_questions, min(11, len(unique_questions)))
 
-    def clean(x):
-        return (
-            x.lower()
-            .replace("!", "").replace("?", "")
-            .replace("¡", "").replace("¿", "")
-            .replace(".", "").replace(",", "")
-            .strip()
-        )
-
     quiz_data = []
     for idx, swe in enumerate(chosen, start=1):
-        eng_list = list(groups[swe])
+        eng_list = groups[swe]
         quiz_data.append({
             "id": idx,
             "question": swe,
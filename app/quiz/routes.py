@@ -1,17 +1,26 @@
-from datetime import datetime
-import math
 import random
 import json
+import uuid
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort, session
 from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
-from app.models import Word, WordList, QuizResult, QuizAnswerLog
+from app.models import Word, WordList, QuizResult
+from app.services.analytics import get_top_wrong_words
+from app.services.answers import advance_answer_index, get_user_answer_index, resolve_answer_forms
+from app.services.results import save_quiz_answers
+from app.services.rollups import current_data_version, get_user_stats, record_daily_answers, record_quiz_stats
+from app.services.sampling import get_word_sampler, record_word_results, sample_list_word_ids
+from app.services.scheduler import due_word_ids
 
 # SKAPA BLUEPRINTEN (den enda!)
 quiz_bp = Blueprint("quiz", __name__, url_prefix="/quiz")
 
+# Antal svåraste ord i svaret från quiz_finish
+HARDEST_LIMIT = 20
+
 
 # ------------------------------------------------------
 # QUIZ SETTINGS
@@ -31,6 +40,8 @@ def quiz_settings():
         selected_lists = request.form.getlist("lists")
         num_questions = request.form.get("num_words", type=int)
         direction = request.form.get("direction", "mix")
+        unique = 1 if request.form.get("unique") else 0
+        mode = request.form.get("mode", "weighted")
 
         if "all" in selected_lists:
             lists_str = "all"
@@ -43,6 +54,8 @@ def quiz_settings():
                 lists=lists_str,
                 num_words=num_questions,
                 direction=direction,
+                unique=unique,
+                mode=mode,
             )
         )
 
@@ -61,54 +74,43 @@ def quiz_take():
     num_words = request.args.get("num_words", type=int, default=5)
     direction = request.args.get("direction", "mix")
 
+    unique = request.args.get("unique", type=int, default=0) == 1
+    mode = request.args.get("mode", "weighted")
+
     # Hämta ordlistor
     if lists_param == "all":
-        words = (
-            Word.query.join(WordList)
-            .filter(WordList.user_id == current_user.id)
-            .all()
-        )
-        all_user_list_ids = [
-            wl.id for wl in WordList.query.filter_by(user_id=current_user.id).all()
-        ]
+        list_ids = None
     else:
         list_ids = [int(x) for x in lists_param.split(",") if x.isdigit()]
-        words = Word.query.filter(Word.list_id.in_(list_ids)).all()
-        all_user_list_ids = list_ids
-
-    if not words:
-        flash("Inga ord i de valda listorna.", "error")
-        return redirect(url_for("quiz.quiz_settings"))
-
-    # ------------------------
-    # Viktning av ord
-    # ------------------------
-    weighted = []
-    weights = []
-
-    for w in words:
-        wrong = w.wrong_count or 0
-        correct = w.correct_count or 0
-        diff = wrong - correct
-
-        weight = 1 if diff <= 0 else 1 + math.log(1 + diff)
-
-        weighted.append(w)
-        weights.append(weight)
-
-    selected = random.choices(weighted, weights=weights, k=num_words)
-
-    def clean(s: str) -> str:
-        return (
-            s.lower()
-            .replace("!", "")
-            .replace("?", "")
-            .replace("¡", "")
-            .replace("¿", "")
-            .replace(".", "")
-            .replace(",", "")
-            .strip()
-        )
+
+    if mode == "due":
+        # ------------------------
+        # Repetition: bara ord som förfallit enligt schemat
+        # ------------------------
+        selected_ids = due_word_ids(current_user.id, list_ids, limit=num_words)
+
+        if not selected_ids:
+            flash("Inga ord att repetera just nu.", "info")
+            return redirect(url_for("quiz.quiz_settings"))
+    else:
+        # ------------------------
+        # Viktning av ord (cachad alias-tabell per användare och listval)
+        # ------------------------
+        sampler = get_word_sampler(current_user.id, list_ids)
+
+        if not len(sampler):
+            flash("Inga ord i de valda listorna.", "error")
+            return redirect(url_for("quiz.quiz_settings"))
+
+        selected_ids = sampler.sample(num_words, unique=unique)
+    words_by_id = {w.id: w for w in Word.query.filter(Word.id.in_(set(selected_ids))).all()}
+    selected = [words_by_id[i] for i in selected_ids if i in words_by_id]
+
+    # Alla alternativa svar slås upp i användarens cachade svarsindex
+    answer_index = get_user_answer_index(current_user.id)
+    answer_forms = resolve_answer_forms(answer_index, selected, list_ids)
+    # Cacharna läser data_version och kan ha byggt user_stats-raden
+    db.session.commit()
 
     quiz_data = []
 
@@ -116,14 +118,9 @@ def quiz_take():
         eng = w.original.strip()
         swe = w.translation.strip()
 
-        # Hämta alla alternativa svar
-        all_translations = Word.query.filter(
-            Word.original == w.original,
-            Word.list_id.in_(all_user_list_ids),
-        ).all()
-
-        all_answer_forms_translation = list({clean(x.translation) for x in all_translations})
-        all_answer_forms_original = list({clean(x.original) for x in all_translations})
+        forms = answer_forms[w.id]
+        all_answer_forms_translation = forms["translation"]
+        all_answer_forms_original = forms["original"]
 
         # Vilket håll frågan ska gå
         if direction == "sv_en":
@@ -150,7 +147,8 @@ def quiz_take():
             }
         )
 
-    return render_template("quiz_take.html", quiz_data=quiz_data)
+    # Nyckeln skickas tillbaka av quiz_finish så att dubbla inskick upptäcks
+    return render_template("quiz_take.html", quiz_data=quiz_data, quiz_key=uuid.uuid4().hex)
 
 @quiz_bp.route("/quick/<int:list_id>")
 @login_required
@@ -161,24 +159,22 @@ def quick_quiz(list_id):
     if wordlist.user_id != current_user.id:
         abort(403)
 
-    words = wordlist.words  # SQLAlchemy relationship
-
     # hur många frågor ska genereras
     QUIZ_SIZE = 11
 
-    if len(words) == 0:
+    # slumpa direkt i databasen istället för att läsa in hela listan
+    ids = sample_list_word_ids(wordlist.id, QUIZ_SIZE)
+
+    if not ids:
         flash("Listan innehåller inga ord.", "error")
         return redirect(url_for("lists.view_all"))
 
-    if len(words) >= QUIZ_SIZE:
-        # 11 helt unika slumpade ord
-        selected = random.sample(words, QUIZ_SIZE)
-    else:
+    if len(ids) < QUIZ_SIZE:
         # färre än 11 ord → repetition tillåten
-        selected = [random.choice(words) for _ in range(QUIZ_SIZE)]
+        ids = [random.choice(ids) for _ in range(QUIZ_SIZE)]
 
     # spara ordens IDs i sessionen för quizet
-    session["quick_quiz_words"] = [w.id for w in selected]
+    session["quick_quiz_words"] = ids
     session["quiz_list_name"] = wordlist.name
 
     return redirect(url_for("quiz.run_quick_quiz"))
@@ -208,70 +204,78 @@ def quiz_finish():
 
     correct = int(request.form.get("correct", 0))
     total = int(request.form.get("total", 0))
+    quiz_key = (request.form.get("quiz_key") or "")[:64] or None
+
+    # Samma förhör inskickat igen (två flikar, omförsök) → spara inget nytt
+    if quiz_key and QuizResult.query.filter_by(user_id=user.id, client_key=quiz_key).first():
+        return _finish_response(user, correct, total, duplicate=True)
 
     # 1) Skapa quiz-resultat
     result = QuizResult(
         user_id=user.id,
         correct_count=correct,
         total_questions=total,
+        client_key=quiz_key,
     )
     db.session.add(result)
-    db.session.flush()  # så vi får ett id direkt utan att committa än
 
-    # 2) Spara per-fråga-logg + uppdatera ord-statistik
+    try:
+        db.session.flush()  # så vi får ett id direkt utan att committa än
+    except IntegrityError:
+        # En samtidig request med samma nyckel hann före
+        db.session.rollback()
+        return _finish_response(user, correct, total, duplicate=True)
+
+    # 2) Spara per-fråga-logg + uppdatera ord-statistik och schema
+    #    (en förhämtning, en UPDATE, en flerradig INSERT)
     answers = request.form.get("answers")
-    if answers:
-        answer_list = json.loads(answers)
-
-        for a in answer_list:
-            word_id = a.get("id")
-            is_correct = bool(a.get("correct"))
-            user_answer = a.get("user_answer", "")
-
-            # Hämta ordet
-            word = Word.query.get(word_id)
-            if not word:
-                continue  # defensivt, om något konstigt skulle ske
-
-            # Uppdatera word-statistik (cache för snabbare viktning)
-            if is_correct:
-                word.correct_count = (word.correct_count or 0) + 1
-            else:
-                word.wrong_count = (word.wrong_count or 0) + 1
-                word.last_wrong = datetime.utcnow()
-
-            # Logga svaret i quiz_answer_log
-            log = QuizAnswerLog(
-                user_id=user.id,
-                quiz_result_id=result.id,
-                word_id=word.id,
-                user_answer=user_answer,
-                is_correct=is_correct,
-            )
-            db.session.add(log)
+    answer_list = json.loads(answers) if answers else []
+    deltas = save_quiz_answers(user.id, result.id, answer_list)
+
+    answered_correct = sum(d[0] for d in deltas.values())
+    answered_wrong = sum(d[1] for d in deltas.values())
+    record_quiz_stats(user.id, correct=answered_correct, wrong=answered_wrong)
+    record_daily_answers(user.id, correct=answered_correct, wrong=answered_wrong)
 
     # 3) Commita allt i ett svep
     db.session.commit()
 
-    # 4) Sammanställ lite övergripande statistik till frontend
-    wordlists = WordList.query.filter_by(user_id=user.id).all()
-    total_words = sum(len(wl.words) for wl in wordlists)
-    total_lists = len(wordlists)
-    total_quizzes = QuizResult.query.filter_by(user_id=user.id).count()
+    # Förhöret ändrar inga ordformer: behåll svarsindex och samplers om ingen
+    # annan skrev emellan (samplerns vikter uppdateras med förhörets svar)
+    version = current_data_version(user.id)
+    advance_answer_index(user.id, version)
+    record_word_results(user.id, deltas, version)
+
+    return _finish_response(user, correct, total)
+
 
-    # Hårdkodad “hardest words”-lista för nu (kan bytas till att bygga på QuizAnswerLog senare)
-    from app.services.analytics import get_hardest_words
+def _finish_response(user, correct, total, duplicate=False):
+    """
+    Sammanställer lite övergripande statistik till frontend: totalerna ur
+    user_stats och de svåraste orden via indexet (list_id, wrong_count),
+    utan att gå igenom svarshistoriken.
+    """
+    stats = get_user_stats(user.id)
 
-    hardest_words = get_hardest_words(user.id)
+    hardest_words = [
+        {
+            "original": w.original,
+            "translation": w.translation,
+            "correct": w.correct_count or 0,
+            "wrong": w.wrong_count or 0,
+            "last_wrong": w.last_wrong.strftime("%d %b") if w.last_wrong else "–",
+        }
+        for w in get_top_wrong_words(user.id, limit=HARDEST_LIMIT)
+    ]
 
     return jsonify(
         {
-            "status": "ok",
+            "status": "duplicate" if duplicate else "ok",
             "correct": correct,
             "total": total,
-            "total_words": total_words,
-            "total_lists": total_lists,
-            "total_quizzes": total_quizzes,
+            "total_words": stats.word_count,
+            "total_lists": stats.list_count,
+            "total_quizzes": stats.quiz_count,
             "hardest_words": hardest_words,
         }
     )
@@ -1,6 +1,21 @@
-from datetime import datetime, timedelta
-from app.models import QuizAnswerLog, Word, WordList
+from datetime import datetime
+
+from sqlalchemy import case, false, func, literal, literal_column, select
+
+from app.models import DailyAnswerStat, QuizAnswerLog, QuizResult, Word, WordList
 from app.extensions import db
+from app.services.rollups import get_user_stats, streaks
+
+
+def _answer_aggregates():
+    """Rätt, fel och senaste fel per ord som SQL-uttryck (GROUP BY word_id)."""
+    return (
+        func.sum(case((QuizAnswerLog.is_correct, 1), else_=0)).label("correct"),
+        func.sum(case((QuizAnswerLog.is_correct, 0), else_=1)).label("wrong"),
+        func.max(QuizAnswerLog.timestamp)
+        .filter(QuizAnswerLog.is_correct == false())
+        .label("last_wrong"),
+    )
 
 
 def get_word_statistics(user_id):
@@ -10,32 +25,26 @@ def get_word_statistics(user_id):
     - correct attempts
     - wrong attempts
     - last wrong date
+
+    Räknas i databasen med en GROUP BY word_id.
     """
 
-    logs = (
-        QuizAnswerLog.query
-        .filter_by(user_id=user_id)
+    rows = (
+        db.session.query(QuizAnswerLog.word_id, *_answer_aggregates())
+        .filter(QuizAnswerLog.user_id == user_id)
+        .group_by(QuizAnswerLog.word_id)
         .all()
     )
 
-    stats = {}
-
-    for log in logs:
-        if log.word_id not in stats:
-            stats[log.word_id] = {
-                "word_id": log.word_id,
-                "correct": 0,
-                "wrong": 0,
-                "last_wrong": None,
-            }
-
-        if log.is_correct:
-            stats[log.word_id]["correct"] += 1
-        else:
-            stats[log.word_id]["wrong"] += 1
-            stats[log.word_id]["last_wrong"] = log.timestamp
-
-    return stats
+    return {
+        r.word_id: {
+            "word_id": r.word_id,
+            "correct": int(r.correct or 0),
+            "wrong": int(r.wrong or 0),
+            "last_wrong": r.last_wrong,
+        }
+        for r in rows
+    }
 
 
 def get_hardest_words(user_id, limit=20):
@@ -43,99 +52,260 @@ def get_hardest_words(user_id, limit=20):
     Returnerar användarens svåraste ord baserat på:
     - flest fel
     - senast felaktigt svar
+
+    En fråga: aggregering per ord, join mot word för texten, ORDER BY + LIMIT.
     """
 
-    stats = get_word_statistics(user_id)
+    correct, wrong, last_wrong = _answer_aggregates()
 
-    # Gör om till lista + hämta ordens text
-    result = []
-    for word_id, s in stats.items():
-        word = Word.query.get(word_id)
-        if not word:
-            continue
+    rows = (
+        db.session.query(Word.original, Word.translation, correct, wrong, last_wrong)
+        .join(Word, Word.id == QuizAnswerLog.word_id)
+        .filter(QuizAnswerLog.user_id == user_id)
+        .group_by(QuizAnswerLog.word_id, Word.original, Word.translation)
+        .order_by(wrong.desc(), last_wrong.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "original": r.original,
+            "translation": r.translation,
+            "correct": int(r.correct or 0),
+            "wrong": int(r.wrong or 0),
+            "last_wrong": _as_datetime(r.last_wrong).strftime("%d %b") if r.last_wrong else "–",
+        }
+        for r in rows
+    ]
 
+
+def _as_datetime(value):
+    # SQLite kan lämna tillbaka aggregerade tidsstämplar som text
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def get_quiz_history(user_id, start=None, end=None):
+    """
+    Rätt, fel och andel rätt per dag, läst från daily_answer_stats
+    (en indexerad intervallfråga på (user_id, day)). start/end är datum, inklusive.
+    """
+
+    query = DailyAnswerStat.query.filter(DailyAnswerStat.user_id == user_id)
+    if start is not None:
+        query = query.filter(DailyAnswerStat.day >= start)
+    if end is not None:
+        query = query.filter(DailyAnswerStat.day <= end)
+
+    result = []
+    for r in query.order_by(DailyAnswerStat.day.asc()):
+        total = r.correct + r.wrong
         result.append({
-            "original": word.original,
-            "translation": word.translation,
-            "correct": s["correct"],
-            "wrong": s["wrong"],
-            "last_wrong": s["last_wrong"].strftime("%d %b") if s["last_wrong"] else "–",
+            "date": r.day.strftime("%Y-%m-%d"),
+            "correct": r.correct,
+            "wrong": r.wrong,
+            "accuracy": round(r.correct / total * 100, 1) if total else 0,
         })
 
-    # sortera på flest fel
-    result.sort(key=lambda x: x["wrong"], reverse=True)
+    return result
 
-    return result[:limit]
 
-def get_quiz_history(user_id):
-    """Returnerar resultat per datum."""
-    logs = (
-        QuizAnswerLog.query
-        .filter_by(user_id=user_id)
-        .order_by(QuizAnswerLog.timestamp.asc())
+def get_daily_streaks(user_id, today=None):
+    """
+    Nuvarande och längsta streak ur daily_answer_stats. Nuvarande streak
+    räknas bara om användaren har övat idag (UTC, samma dag som rollupen).
+    """
+
+    today = today or datetime.utcnow().date()
+    days = list(db.session.scalars(
+        select(DailyAnswerStat.day)
+        .where(DailyAnswerStat.user_id == user_id)
+        .order_by(DailyAnswerStat.day)
+    ))
+
+    current, longest = streaks(days)
+    if not days or days[-1] != today:
+        current = 0
+
+    return {"current": current, "longest": longest}
+
+
+def get_top_wrong_words(user_id, limit=20, offset=0):
+    """Top-K ord efter wrong_count, via indexet (list_id, wrong_count)."""
+    return (
+        db.session.query(
+            Word.original,
+            Word.translation,
+            Word.correct_count,
+            Word.wrong_count,
+            Word.last_wrong,
+        )
+        .join(WordList, Word.list_id == WordList.id)
+        .filter(WordList.user_id == user_id, Word.wrong_count > 0)
+        .order_by(Word.wrong_count.desc(), Word.id)
+        .offset(offset)
+        .limit(limit)
         .all()
     )
 
-    by_day = {}
 
-    for log in logs:
-        day = log.timestamp.strftime("%Y-%m-%d")
+# ------------------------------------------------------
+# TIDSSERIE FÖR GRAFER
+# ------------------------------------------------------
 
-        if day not in by_day:
-            by_day[day] = {"correct": 0, "wrong": 0}
+# Tillåtna hinkar; enheten skrivs in i SQL:en som en literal
+BUCKETS = ("day", "week", "month")
 
-        if log.is_correct:
-            by_day[day]["correct"] += 1
-        else:
-            by_day[day]["wrong"] += 1
 
-    result = []
-    for day, v in by_day.items():
-        total = v["correct"] + v["wrong"]
-        accuracy = round((v["correct"] / total) * 100, 1) if total else 0
+def _bucket_expr(bucket, dialect):
+    """Datumhink för QuizResult.date i den angivna databasen."""
+    if bucket not in BUCKETS:
+        raise ValueError(f"okänd hink: {bucket}")
 
-        result.append({
-            "date": day,
-            "correct": v["correct"],
-            "wrong": v["wrong"],
-            "accuracy": accuracy,
-        })
+    if dialect == "postgresql":
+        # Som bundet värde blir det date_trunc(%s, ...) både i SELECT och GROUP BY.
+        # pg8000 binder på servern, så Postgres ser två olika parametrar och
+        # godtar inte uttrycken som samma gruppering.
+        return func.date_trunc(literal_column(f"'{bucket}'"), QuizResult.date)
 
-    return result
+    if bucket == "week":
+        # måndagen i samma vecka
+        return func.date(QuizResult.date, "weekday 0", "-6 days")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", QuizResult.date)
+    return func.date(QuizResult.date)
 
-from datetime import datetime, timedelta
 
-def get_daily_streaks(user_id):
-    """Returnerar nuvarande streak och längsta streak."""
-    logs = (
-        QuizAnswerLog.query
-        .filter_by(user_id=user_id)
-        .order_by(QuizAnswerLog.timestamp.asc())
-        .all()
-    )
+def _as_bucket_datetime(value):
+    if isinstance(value, str):
+        return datetime.strptime(value[:10], "%Y-%m-%d")
+    return value
+
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets: behåller kurvans form med threshold punkter.
 
-    if not logs:
-        return {"current": 0, "longest": 0}
+    points är en lista av (x, y) sorterad på x.
+    """
+
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # medelpunkt i nästa hink
+        start = int((i + 1) * every) + 1
+        end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(p[0] for p in points[start:end]) / (end - start)
+        avg_y = sum(p[1] for p in points[start:end]) / (end - start)
+
+        # punkten i aktuell hink som ger störst triangel
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        ax, ay = points[a]
+
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        sampled.append(points[best])
+        a = best
 
-    # extrahera unika dagar
-    days = sorted({log.timestamp.date() for log in logs})
+    sampled.append(points[-1])
+    return sampled
 
-    longest = 1
-    current = 1
 
-    for i in range(1, len(days)):
-        prev = days[i - 1]
-        curr = days[i]
+def get_quiz_series(user_id, bucket="auto", target_points=60, start=None, end=None):
+    """
+    Förhörsresultat över tid, aggregerat i databasen och nedsamplat.
+
+    bucket: "day", "week", "month", "raw" eller "auto" (väljs efter historikens
+    längd). start/end begränsar till start <= date < end. Varje punkt är
+    medelpoängen i hinken. Returnerar högst target_points punkter:
+    [{"date": datetime, "score": float, "quizzes": int}].
+    """
 
-        if curr == prev + timedelta(days=1):
-            current += 1
-            longest = max(longest, current)
+    filters = [QuizResult.user_id == user_id, QuizResult.date.isnot(None)]
+    if start is not None:
+        filters.append(QuizResult.date >= start)
+    if end is not None:
+        filters.append(QuizResult.date < end)
+
+    if bucket == "auto":
+        first, last, count = (
+            db.session.query(
+                func.min(QuizResult.date),
+                func.max(QuizResult.date),
+                func.count(QuizResult.id),
+            )
+            .filter(*filters)
+            .one()
+        )
+        if first is None:
+            return []
+
+        span_days = (last - first).days
+        if count <= target_points * 4:
+            bucket = "raw"
+        elif span_days <= target_points * 7:
+            bucket = "day"
+        elif span_days <= target_points * 30:
+            bucket = "week"
         else:
-            current = 1
+            bucket = "month"
+
+    if bucket == "raw":
+        rows = (
+            db.session.query(QuizResult.date, QuizResult.correct_count, literal(1))
+            .filter(*filters)
+            .order_by(QuizResult.date.asc())
+            .all()
+        )
+    else:
+        period = _bucket_expr(bucket, db.session.get_bind().dialect.name).label("period")
+        rows = (
+            db.session.query(period, func.avg(QuizResult.correct_count), func.count(QuizResult.id))
+            .filter(*filters)
+            .group_by(period)
+            .order_by(period)
+            .all()
+        )
+
+    series = [
+        (_as_bucket_datetime(r[0]), round(float(r[1] or 0), 2), int(r[2]))
+        for r in rows
+    ]
+
+    # LTTB på (tidpunkt, poäng); antal förhör följer med punkten
+    points = [(d.timestamp(), score, i) for i, (d, score, _) in enumerate(series)]
+    kept = lttb(points, target_points)
+
+    return [
+        {"date": series[p[2]][0], "score": series[p[2]][1], "quizzes": series[p[2]][2]}
+        for p in kept
+    ]
+
+
+def get_profile_stats(user_id):
+    """
+    Det profilsidan renderar direkt: totalerna från user_stats.
 
-    # kolla om streaken bröts idag
-    if days[-1] != datetime.utcnow().date():
-        current = 0
+    Graf och svåraste ord hämtas av sidan från /stats/api/*.
+    """
 
-    return {"current": current, "longest": longest}
+    stats = get_user_stats(user_id)
 
+    return {
+        "total_words": stats.word_count,
+        "total_lists": stats.list_count,
+        "total_quizzes": stats.quiz_count,
+    }
@@ -0,0 +1,168 @@
+from app.extensions import db
+from app.models import Word, WordList
+from app.services.cache import LRUCache
+from app.services.rollups import current_data_version
+
+
+# Ett index per användare / publik nivålista, byggs vid första förhöret.
+# Användarnas index lagras som (data_version, index) och jämförs vid varje
+# läsning, så att skrivningar i andra workers också slår igenom.
+_answer_indexes = LRUCache(maxsize=512, max_age=600)
+
+
+def clean(s: str) -> str:
+    """Normaliserar ett svar så att skiljetecken och versaler inte spelar roll."""
+    return (
+        s.lower()
+        .replace("!", "")
+        .replace("?", "")
+        .replace("¡", "")
+        .replace("¿", "")
+        .replace(".", "")
+        .replace(",", "")
+        .strip()
+    )
+
+
+class AnswerIndex:
+    """
+    Svarsformer för en mängd ord, nycklade på normaliserad form.
+
+    by_original:    clean(original)    -> [(list_id, original, translation)]
+    by_translation: clean(translation) -> [(list_id, original, translation)]
+    """
+
+    def __init__(self, rows):
+        self.by_original = {}
+        self.by_translation = {}
+        self._groups = None
+
+        for list_id, original, translation in rows:
+            original = (original or "").strip()
+            translation = (translation or "").strip()
+            if not original or not translation:
+                continue
+
+            entry = (list_id, original, translation)
+            self.by_original.setdefault(clean(original), []).append(entry)
+            self.by_translation.setdefault(clean(translation), []).append(entry)
+
+    @staticmethod
+    def _entries(mapping, key, list_ids):
+        entries = mapping.get(clean(key or ""), [])
+        if list_ids is None:
+            return entries
+        return [e for e in entries if e[0] in list_ids]
+
+    def translations(self, original, list_ids=None):
+        """Alla städade översättningar till ett original."""
+        return list({clean(e[2]) for e in self._entries(self.by_original, original, list_ids)})
+
+    def originals(self, translation, list_ids=None):
+        """Alla städade original som har den här översättningen."""
+        return list({clean(e[1]) for e in self._entries(self.by_translation, translation, list_ids)})
+
+    def groups(self):
+        """{original: [översättningar]} med första stavningen som visningsform."""
+        if self._groups is None:
+            result = {}
+            for entries in self.by_original.values():
+                seen = []
+                for e in entries:
+                    if e[2] not in seen:
+                        seen.append(e[2])
+                result[entries[0][1]] = seen
+            self._groups = result
+        return self._groups
+
+
+def get_user_answer_index(user_id):
+    """
+    Hämtar (eller bygger) svarsindexet för alla användarens listor.
+
+    Kostar en uppslagning av user_stats.data_version per anrop; indexet byggs
+    om när versionen ändrats, oavsett vilken worker som skrev.
+    """
+
+    key = ("user", user_id)
+    version = current_data_version(user_id)
+    cached = _answer_indexes.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    # Versionen läses före orden: hinner någon skriva emellan blir indexet
+    # nyare än versionen och byggs bara om en gång för mycket
+    rows = (
+        db.session.query(Word.list_id, Word.original, Word.translation)
+        .join(WordList, Word.list_id == WordList.id)
+        .filter(WordList.user_id == user_id)
+        .all()
+    )
+    index = AnswerIndex(rows)
+    _answer_indexes.set(key, (version, index))
+
+    return index
+
+
+def advance_answer_index(user_id, version):
+    """
+    Anropas efter en skrivning som inte ändrar några ord (t.ex. quiz_finish)
+    med den nya versionen. Var den cachade versionen precis en före har ingen
+    annan skrivit emellan, och indexet kan behållas i stället för att byggas om.
+    """
+
+    key = ("user", user_id)
+    cached = _answer_indexes.get(key)
+    if cached and version is not None and cached[0] == version - 1:
+        _answer_indexes.set(key, (version, cached[1]))
+
+
+def get_list_answer_index(list_id):
+    """Svarsindex för en enskild lista, t.ex. de publika nivålistorna."""
+    key = ("list", list_id)
+    index = _answer_indexes.get(key)
+
+    if index is None:
+        rows = (
+            db.session.query(Word.list_id, Word.original, Word.translation)
+            .filter(Word.list_id == list_id)
+            .all()
+        )
+        index = AnswerIndex(rows)
+        _answer_indexes.set(key, index)
+
+    return index
+
+
+def invalidate_answer_index(user_id=None, list_id=None):
+    """
+    Anropas av alla skrivvägar som ändrar ord. För användare är det bara en
+    genväg i den egna workern; övriga ser den nya data_version vid nästa läsning.
+    Publika listor har ingen version och förlitar sig på max_age i andra workers.
+    """
+    if user_id is not None:
+        _answer_indexes.pop(("user", user_id))
+    if list_id is not None:
+        _answer_indexes.pop(("list", list_id))
+
+
+def resolve_answer_forms(index, words, list_ids=None):
+    """
+    Slår upp svarsformerna för de valda orden i ett färdigt index.
+
+    Returnerar {word_id: {"translation": [...], "original": [...]}}.
+    """
+
+    list_ids = set(list_ids) if list_ids is not None else None
+    forms = {}
+
+    for w in words:
+        if w.id in forms:
+            continue
+
+        forms[w.id] = {
+            "translation": index.translations(w.original, list_ids) or [clean(w.translation)],
+            "original": index.originals(w.translation, list_ids) or [clean(w.original)],
+        }
+
+    return forms
@@ -0,0 +1,157 @@
+from collections import Counter
+
+from sqlalchemy import case, insert, select, update
+
+from app.extensions import db
+from app.models import Word, WordList
+from app.services.deletion import delete_words
+from app.services.dictionary import global_keys, sync_dictionary
+from app.services.rollups import bump_list_word_counts, bump_user_stats
+
+
+MAX_OPS = 1000
+MAX_LENGTH = 255
+
+OPS = ("create", "update", "move", "delete")
+
+
+def _id(value):
+    # JSON-id:n måste vara heltal; listor och objekt går inte ens att slå upp i en mängd
+    return value if type(value) is int else None
+
+
+def _text(value):
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    return value if 0 < len(value) <= MAX_LENGTH else None
+
+
+def apply_word_ops(wordlist, ops):
+    """
+    Kör en batch create/update/move/delete mot en lista i samma transaktion.
+
+    Ägarskapet kontrolleras med en fråga för orden och en för mållistorna.
+    Därefter körs högst en INSERT, en UPDATE för ändringar (CASE per ord-id),
+    en UPDATE för flyttar och två DELETE, oavsett hur många operationer batchen har.
+    Ogiltiga operationer hoppas över och rapporteras; anroparen committar.
+
+    Returnerar en resultatrad per operation, i samma ordning som ops.
+    """
+
+    results = [{"index": i, "ok": False} for i in range(len(ops))]
+
+    ids = [
+        _id(op.get("id")) for op in ops
+        if isinstance(op, dict) and op.get("op") != "create"
+    ]
+    ids = [i for i in ids if i is not None]
+    owned = set(db.session.scalars(
+        select(Word.id).where(Word.list_id == wordlist.id, Word.id.in_(ids))
+    )) if ids else set()
+
+    targets = {
+        _id(op.get("to_list")) for op in ops
+        if isinstance(op, dict) and op.get("op") == "move"
+    } - {None}
+    targets = set(db.session.scalars(
+        select(WordList.id).where(WordList.user_id == wordlist.user_id, WordList.id.in_(targets))
+    )) if targets else set()
+
+    # Samma ord får bara förekomma i en operation per batch
+    repeated = {i for i, n in Counter(ids).items() if n > 1}
+
+    creates, creates_at = [], []
+    updates = {}
+    moves = {}
+    deletes = []
+
+    for i, op in enumerate(ops):
+        result = results[i]
+        kind = op.get("op") if isinstance(op, dict) else None
+        result["op"] = kind
+
+        if kind not in OPS:
+            result["error"] = "Okänd operation."
+            continue
+
+        if kind == "create":
+            original, translation = _text(op.get("original")), _text(op.get("translation"))
+            if not original or not translation:
+                result["error"] = "Båda fälten måste fyllas i (1–255 tecken)."
+                continue
+            creates.append({"original": original, "translation": translation, "list_id": wordlist.id})
+            creates_at.append(i)
+            continue
+
+        word_id = _id(op.get("id"))
+        result["id"] = word_id
+        if word_id not in owned:
+            result["error"] = "Ordet finns inte i listan."
+            continue
+        if word_id in repeated:
+            result["error"] = "Ordet förekommer i flera operationer."
+            continue
+
+        if kind == "update":
+            fields = {f: _text(op[f]) for f in ("original", "translation") if f in op}
+            if not fields or None in fields.values():
+                result["error"] = "Ogiltigt värde (1–255 tecken)."
+                continue
+            updates[word_id] = fields
+
+        elif kind == "move":
+            to_list = _id(op.get("to_list"))
+            if to_list not in targets or to_list == wordlist.id:
+                result["error"] = "Ogiltig mållista."
+                continue
+            moves[word_id] = to_list
+
+        else:
+            deletes.append(word_id)
+
+        result["ok"] = True
+
+    if creates:
+        new_ids = db.session.scalars(
+            insert(Word).returning(Word.id, sort_by_parameter_order=True), creates
+        ).all()
+        for i, word_id in zip(creates_at, new_ids):
+            results[i].update(ok=True, id=word_id)
+
+    if updates:
+        # Godkända ord byter nyckel i ordboken: både gamla och nya räknas om
+        keys = global_keys(Word.id.in_(list(updates)))
+        values = {}
+        for field in ("original", "translation"):
+            changed = {word_id: f[field] for word_id, f in updates.items() if field in f}
+            if changed:
+                values[field] = case(changed, value=Word.id, else_=getattr(Word, field))
+
+        db.session.execute(
+            update(Word)
+            .where(Word.id.in_(list(updates)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        sync_dictionary(keys + global_keys(Word.id.in_(list(updates))))
+
+    if moves:
+        db.session.execute(
+            update(Word)
+            .where(Word.id.in_(list(moves)))
+            .values(list_id=case(moves, value=Word.id, else_=Word.list_id))
+            .execution_options(synchronize_session=False)
+        )
+
+    delete_words(deletes)
+
+    # Räknarna: listan tappar flyttade och borttagna ord, mållistorna får de
+    # flyttade; alla listor i en UPDATE
+    bump_list_word_counts({
+        wordlist.id: len(creates) - len(moves) - len(deletes),
+        **Counter(moves.values()),
+    })
+    bump_user_stats(wordlist.user_id, word_count=len(creates) - len(deletes))
+
+    return results
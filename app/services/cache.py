@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import make_response, request, session
+
+
+class LRUCache:
+    """
+    Enkel trådsäker LRU-cache per process.
+
+    Varje gunicorn-worker har sin egen instans, så cachen måste alltid
+    kunna byggas om från databasen. max_age sätter en övre gräns för hur
+    länge ett värde lever även om ingen invalidering når just den workern.
+    """
+
+    def __init__(self, maxsize=256, max_age=None):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            value, stored_at = item
+            if self.max_age is not None and time.monotonic() - stored_at > self.max_age:
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[0] if item else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def conditional_render(etag, render, cache_control="private, no-cache"):
+    """
+    Svarar 304 Not Modified om klienten redan har etag, annars anropas render().
+
+    Standardvärdet Cache-Control: no-cache gör att webbläsaren alltid frågar
+    men slipper ladda ner sidan igen när inget har ändrats.
+    """
+
+    # Väntande flash-meddelanden måste renderas, så då aldrig 304
+    if etag in request.if_none_match and not session.get("_flashes"):
+        response = make_response("", 304)
+    else:
+        response = make_response(render())
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Cookie")
+    return response
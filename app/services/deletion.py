@@ -0,0 +1,72 @@
+from sqlalchemy import delete, select
+
+from app.extensions import db
+from app.models import ListShare, QuizAnswerLog, Word, WordList
+from app.services.dictionary import global_keys, sync_dictionary
+from app.services.rollups import unrecord_answer_logs
+
+
+def delete_words(word_ids):
+    """
+    Tar bort ord och deras svarsloggar med två mängdbaserade DELETE,
+    utan att ladda några rader i Python. Loggarnas rätt/fel dras av från
+    user_stats och daily_answer_stats, och godkända ord räknas ner i
+    ordboken; anroparen räknar ner word_count och committar.
+    """
+
+    word_ids = list(word_ids)
+    if not word_ids:
+        return
+
+    keys = global_keys(Word.id.in_(word_ids))
+    logs = QuizAnswerLog.word_id.in_(word_ids)
+    unrecord_answer_logs(logs)
+    db.session.execute(
+        delete(QuizAnswerLog)
+        .where(logs)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        delete(Word)
+        .where(Word.id.in_(word_ids))
+        .execution_options(synchronize_session=False)
+    )
+    sync_dictionary(keys)
+
+
+def delete_list(list_id):
+    """
+    Tar bort en lista med ord, svarsloggar och delningar.
+
+    Varje steg är en DELETE med underfråga på list_id, så tiden beror inte
+    på antal objekt i sessionen. På Postgres har FK:erna dessutom ON DELETE
+    CASCADE; de explicita satserna behövs för SQLite, som inte upprätthåller
+    FK:er som standard. Loggarnas rätt/fel dras av från user_stats och
+    daily_answer_stats, och godkända ord räknas ner i ordboken; anroparen
+    räknar ner övriga räknare och committar.
+    """
+
+    keys = global_keys(Word.list_id == list_id)
+    logs = QuizAnswerLog.word_id.in_(select(Word.id).where(Word.list_id == list_id))
+    unrecord_answer_logs(logs)
+    db.session.execute(
+        delete(QuizAnswerLog)
+        .where(logs)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        delete(Word)
+        .where(Word.list_id == list_id)
+        .execution_options(synchronize_session=False)
+    )
+    sync_dictionary(keys)
+    db.session.execute(
+        delete(ListShare)
+        .where(ListShare.list_id == list_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        delete(WordList)
+        .where(WordList.id == list_id)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,228 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime
+
+from sqlalchemy import and_, delete, exists, func, literal, select, true, tuple_
+
+from app.extensions import db
+from app.models import DictionaryEntry, Word
+from app.services.rollups import upsert
+
+
+# Hur ofta (sekunder) en worker frågar databasen om ordboken har ändrats
+CHECK_INTERVAL = 30
+
+# Prefix upp till den här längden får en förberäknad topplista, så att
+# uppslag på en eller två bokstäver inte rankar en stor del av ordboken
+SHORT_PREFIX = 2
+
+# Längd på de förberäknade topplistorna (api_suggest ger högst 20)
+TOP_K = 20
+
+
+def fold(text):
+    """Sökform: gemener utan accenter ("Café" -> "cafe")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip()
+
+
+# ------------------------------------------------------
+# SYNK FRÅN GODKÄNDA ORD
+# ------------------------------------------------------
+
+def sync_dictionary(keys=None):
+    """
+    För in godkända ord (Word.is_global) i dictionary_entry med en
+    INSERT ... SELECT ... GROUP BY och ON CONFLICT på den normaliserade nyckeln.
+
+    keys: [(lower(original), lower(translation)), ...] eller None för alla.
+    usage_count sätts till det aktuella antalet, så körningen är idempotent;
+    poster vars nyckel inte längre har något godkänt ord tas bort.
+    Anroparen committar.
+    """
+
+    norm_original = func.lower(Word.original)
+    norm_translation = func.lower(Word.translation)
+
+    condition = Word.is_global == true()
+    entries = true()
+    if keys is not None:
+        if not keys:
+            return
+        condition = and_(condition, tuple_(norm_original, norm_translation).in_(keys))
+        entries = tuple_(DictionaryEntry.norm_original, DictionaryEntry.norm_translation).in_(keys)
+
+    rows = (
+        select(
+            func.min(Word.original),
+            func.min(Word.translation),
+            norm_original,
+            norm_translation,
+            func.count(),
+            literal(datetime.utcnow()),
+        )
+        .where(condition)
+        .group_by(norm_original, norm_translation)
+    )
+
+    stmt = upsert(DictionaryEntry).from_select(
+        ["original", "translation", "norm_original", "norm_translation", "usage_count", "updated_at"],
+        rows,
+    )
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["norm_original", "norm_translation"],
+            set_={
+                "usage_count": stmt.excluded.usage_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+    # Nycklar vars sista godkända ord tagits bort eller ändrats
+    db.session.execute(
+        delete(DictionaryEntry)
+        .where(
+            entries,
+            ~exists().where(
+                Word.is_global == true(),
+                norm_original == DictionaryEntry.norm_original,
+                norm_translation == DictionaryEntry.norm_translation,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def global_keys(condition):
+    """
+    Ordboksnycklar för godkända ord som matchar condition. Hämtas innan ord
+    tas bort eller ändras, och skickas sedan till sync_dictionary.
+    """
+    return [
+        tuple(key)
+        for key in db.session.execute(
+            select(func.lower(Word.original), func.lower(Word.translation))
+            .where(Word.is_global == true(), condition)
+            .distinct()
+        )
+    ]
+
+
+def word_key(word_id):
+    """Ordets ordboksnyckel, normaliserad av databasen precis som i sync_dictionary."""
+    return db.session.execute(
+        select(func.lower(Word.original), func.lower(Word.translation)).where(Word.id == word_id)
+    ).one()
+
+
+def rebuild_dictionary():
+    """Bygger om hela ordboken från godkända ord. Returnerar antal poster."""
+    db.session.execute(delete(DictionaryEntry))
+    sync_dictionary()
+    return db.session.scalar(select(func.count()).select_from(DictionaryEntry))
+
+
+def dictionary_version():
+    """Ändras när en post läggs till eller uppdateras (en billig aggregatfråga)."""
+    count, updated = db.session.execute(
+        select(func.count(), func.max(DictionaryEntry.updated_at))
+    ).one()
+    return count, updated
+
+
+# ------------------------------------------------------
+# PREFIXINDEX I MINNET
+# ------------------------------------------------------
+
+def _rank(prefix):
+    # Exakt träff först, sedan vanligast; lika vanliga i bokstavsordning
+    return lambda item: (item[0] != prefix, -item[1][2], item[0])
+
+
+class PrefixIndex:
+    """
+    Sorterad lista av vikta nycklar; ett prefix motsvarar ett sammanhängande
+    intervall som hittas med två bisect. Ingen databas vid uppslag.
+
+    Hela intervallet rankas innan det kortas av, så att vanliga ord långt
+    fram i alfabetet inte faller bort. Korta prefix, där intervallet kan
+    vara en stor del av ordboken, har färdiga topplistor (TOP_K).
+    """
+
+    def __init__(self, entries):
+        # entries: (original, translation, usage_count)
+        items = sorted(
+            ((fold(o), o, t, n) for o, t, n in entries),
+            key=lambda e: (e[0], -e[3]),
+        )
+        self.keys = [e[0] for e in items]
+        self.entries = [(o, t, n) for _, o, t, n in items]
+
+        self.top = {}
+        for length in range(1, SHORT_PREFIX + 1):
+            prefixes = {key[:length] for key in self.keys if len(key) >= length}
+            for prefix in prefixes:
+                self.top[prefix] = self._ranked(prefix, TOP_K)
+
+    def _ranked(self, prefix, limit):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\uffff", lo)
+        return heapq.nsmallest(limit, zip(self.keys[lo:hi], self.entries[lo:hi]), key=_rank(prefix))
+
+    def suggest(self, prefix, limit=8):
+        prefix = fold(prefix)
+        if not prefix:
+            return []
+
+        if prefix in self.top and limit <= TOP_K:
+            ranked = self.top[prefix]
+        else:
+            ranked = self._ranked(prefix, limit)
+        return [{"original": o, "translation": t} for _, (o, t, _n) in ranked[:limit]]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+_index = None
+_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_dictionary_index():
+    """
+    Processens prefixindex. Byggs vid första uppslaget i varje worker och
+    byggs om när dictionary_version() ändrats (kontrolleras högst var
+    CHECK_INTERVAL sekund, eller direkt efter invalidate_dictionary()).
+    """
+
+    global _index, _version, _checked_at
+
+    if _index is not None and time.monotonic() - _checked_at < CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < CHECK_INTERVAL:
+            return _index
+
+        version = dictionary_version()
+        if _index is None or version != _version:
+            entries = db.session.execute(
+                select(DictionaryEntry.original, DictionaryEntry.translation, DictionaryEntry.usage_count)
+            ).all()
+            _index = PrefixIndex(entries)
+            _version = version
+
+        _checked_at = time.monotonic()
+        return _index
+
+
+def invalidate_dictionary():
+    """Tvingar fram en versionskontroll vid nästa uppslag i den här workern."""
+    global _checked_at
+    _checked_at = 0.0
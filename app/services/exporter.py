@@ -0,0 +1,193 @@
+import csv
+import io
+import json
+import tempfile
+import zlib
+from datetime import date, datetime
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import QuizAnswerLog, Word, WordList
+
+
+# Antal rader som hämtas per FETCH från databasens cursor
+YIELD_PER = 2000
+
+# Ungefärlig storlek på varje chunk som skickas till klienten
+CHUNK_SIZE = 64 * 1024
+
+# Excels gräns per blad, rubrikraden inräknad; längre exporter fortsätter
+# på nästa blad med samma rubriker
+XLSX_MAX_ROWS = 1_048_576
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+WORD_COLUMNS = ["list", "original", "translation", "correct", "wrong", "last_wrong"]
+HISTORY_COLUMNS = ["timestamp", "quiz_id", "list", "original", "translation", "answer", "correct"]
+
+
+def stream_rows(stmt):
+    """Radvis iteration över en server-side cursor, utan att ladda allt i minnet."""
+    result = db.session.execute(stmt.execution_options(yield_per=YIELD_PER))
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
+
+
+def word_rows(user_id, list_id=None):
+    """Användarens ord (alla listor eller en), sorterade per lista."""
+    stmt = (
+        select(
+            WordList.name,
+            Word.original,
+            Word.translation,
+            Word.correct_count,
+            Word.wrong_count,
+            Word.last_wrong,
+        )
+        .join(WordList, Word.list_id == WordList.id)
+        .where(WordList.user_id == user_id)
+        .order_by(Word.list_id, Word.id)
+    )
+    if list_id is not None:
+        stmt = stmt.where(Word.list_id == list_id)
+
+    return WORD_COLUMNS, stream_rows(stmt)
+
+
+def history_rows(user_id):
+    """Användarens alla svar i förhör, äldst först."""
+    stmt = (
+        select(
+            QuizAnswerLog.timestamp,
+            QuizAnswerLog.quiz_result_id,
+            WordList.name,
+            Word.original,
+            Word.translation,
+            QuizAnswerLog.user_answer,
+            QuizAnswerLog.is_correct,
+        )
+        .join(Word, QuizAnswerLog.word_id == Word.id)
+        .join(WordList, Word.list_id == WordList.id)
+        .where(QuizAnswerLog.user_id == user_id)
+        .order_by(QuizAnswerLog.id)
+    )
+
+    return HISTORY_COLUMNS, stream_rows(stmt)
+
+
+def _value(v):
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return v
+
+
+def _csv_chunks(columns, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    # BOM så att Excel öppnar filen som UTF-8
+    buf.write("\ufeff")
+    writer.writerow(columns)
+
+    for row in rows:
+        writer.writerow(["" if v is None else _value(v) for v in row])
+        if buf.tell() >= CHUNK_SIZE:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+
+    yield buf.getvalue().encode("utf-8")
+
+
+def _jsonl_chunks(columns, rows):
+    lines = []
+    size = 0
+
+    for row in rows:
+        line = json.dumps(dict(zip(columns, map(_value, row))), ensure_ascii=False)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_SIZE:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines, size = [], 0
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _xlsx_chunks(columns, rows):
+    # write_only skriver raderna till disk direkt; filen kan först skickas
+    # när den är färdig (zip-katalogen ligger sist), men minnet växer inte
+    # med antalet rader
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet, used = None, XLSX_MAX_ROWS
+    for row in rows:
+        if used >= XLSX_MAX_ROWS:
+            sheet = workbook.create_sheet(f"Export {len(workbook.worksheets) + 1}")
+            sheet.append(columns)
+            used = 1
+        sheet.append(list(row))
+        used += 1
+
+    if sheet is None:
+        workbook.create_sheet("Export 1").append(columns)
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(columns, rows, fmt, gzip=False):
+    """Byte-chunks för en strömmande response i valt format."""
+    if fmt == "xlsx":
+        chunks = _xlsx_chunks(columns, rows)
+    elif fmt == "jsonl":
+        chunks = _jsonl_chunks(columns, rows)
+    else:
+        chunks = _csv_chunks(columns, rows)
+
+    return _gzip(chunks) if gzip else chunks
+
+
+def export_response(columns, rows, fmt, filename, gzip=False):
+    """
+    Strömmande nedladdning. Raderna hämtas medan svaret skickas, så minnet
+    inte växer med exportens storlek. CSV och JSONL börjar skickas direkt;
+    XLSX byggs först i en temporärfil och delas upp på flera blad vid
+    XLSX_MAX_ROWS.
+    """
+
+    mimetype, ext = FORMATS.get(fmt, FORMATS["csv"])
+    filename = f"{filename}.{ext}"
+
+    headers = {"Cache-Control": "private, no-store"}
+    if gzip:
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    chunks = export_chunks(columns, rows, fmt, gzip=gzip)
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
@@ -0,0 +1,163 @@
+import csv
+import io
+import os
+import re
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Word
+from app.services.answers import clean
+from app.services.rollups import bump_list_word_count, bump_user_stats
+
+
+# Antal rader per flerradig INSERT
+BATCH_SIZE = 5000
+
+MAX_LENGTH = 255
+
+# Första raden hoppas över om den ser ut som en rubrik
+HEADER_NAMES = {
+    "original", "translation", "ord", "översättning", "glosa",
+    "svenska", "engelska", "word", "swedish", "english",
+}
+
+SUPPORTED_EXTENSIONS = (".csv", ".tsv", ".txt", ".xlsx")
+
+_whitespace = re.compile(r"\s+")
+
+
+class ImportFileError(ValueError):
+    """Filen kan inte importeras (fel format eller trasig fil)."""
+
+
+def _normalize(value):
+    if value is None:
+        return ""
+    return _whitespace.sub(" ", str(value)).strip()[:MAX_LENGTH]
+
+
+def _iter_csv(stream, delimiter=None):
+    # Trasigt innehåll ska bli ett felmeddelande till användaren, inte ett 500
+    try:
+        yield from _read_csv(stream, delimiter)
+    except UnicodeDecodeError as exc:
+        raise ImportFileError("Filen måste vara UTF-8-kodad.") from exc
+    except csv.Error as exc:
+        raise ImportFileError("Kunde inte läsa CSV-filen.") from exc
+
+
+def _read_csv(stream, delimiter=None):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if delimiter is None:
+        sample = text.read(4096)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+        except csv.Error:
+            delimiter = ","
+        lines = csv.reader(io.StringIO(sample + text.readline()), delimiter=delimiter)
+        yield from lines
+
+    yield from csv.reader(text, delimiter=delimiter)
+
+
+def _iter_xlsx(stream):
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFileError("Kunde inte läsa Excel-filen.") from exc
+
+    try:
+        for row in workbook.active.iter_rows(max_col=2, values_only=True):
+            yield row
+    except ImportFileError:
+        raise
+    except Exception as exc:
+        # Arket läses först här (read_only), så trasiga zip/XML-delar syns nu
+        raise ImportFileError("Kunde inte läsa Excel-filen.") from exc
+    finally:
+        workbook.close()
+
+
+def iter_word_rows(stream, filename):
+    """
+    Läser (original, translation) rad för rad ur en CSV/TSV- eller XLSX-fil
+    utan att ladda hela filen. Tomma rader och en eventuell rubrikrad hoppas över.
+    Fel i filens innehåll kastas som ImportFileError under iterationen.
+    """
+
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ImportFileError("Filformatet stöds inte (CSV, TSV eller XLSX).")
+
+    if ext == ".xlsx":
+        rows = _iter_xlsx(stream)
+    elif ext in (".tsv", ".txt"):
+        rows = _iter_csv(stream, delimiter="\t")
+    else:
+        rows = _iter_csv(stream)
+
+    first = True
+    for row in rows:
+        if not row or len(row) < 2:
+            continue
+
+        original, translation = _normalize(row[0]), _normalize(row[1])
+        if first:
+            first = False
+            if original.lower() in HEADER_NAMES and translation.lower() in HEADER_NAMES:
+                continue
+
+        if original and translation:
+            yield original, translation
+
+
+def import_words(wordlist, rows, batch_size=BATCH_SIZE):
+    """
+    Lägger till ord i en lista med flerradiga INSERTs, batch_size rader åt gången.
+
+    Rader som redan finns i listan, eller förekommer flera gånger i filen,
+    (jämfört på städad form) hoppas över. Räknarna uppdateras i samma
+    transaktion; anroparen committar. Returnerar (tillagda, överhoppade).
+    """
+
+    seen = {
+        (clean(o), clean(t))
+        for o, t in db.session.query(Word.original, Word.translation)
+        .filter(Word.list_id == wordlist.id)
+    }
+
+    added = skipped = 0
+    batch = []
+
+    def flush():
+        if batch:
+            # Med RETURNING går executemany via insertmanyvalues: flerradiga
+            # INSERTs som SQLAlchemy bygger ihop utan att kompilera varje rad,
+            # i stället för en INSERT per rad med pg8000 (som i batch.py)
+            db.session.execute(insert(Word).returning(Word.id), batch)
+            batch.clear()
+
+    for original, translation in rows:
+        key = (clean(original), clean(translation))
+        if key in seen:
+            skipped += 1
+            continue
+
+        seen.add(key)
+        batch.append({"original": original, "translation": translation, "list_id": wordlist.id})
+        added += 1
+
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+
+    bump_list_word_count(wordlist.id, added)
+    if wordlist.user_id is not None:
+        bump_user_stats(wordlist.user_id, word_count=added)
+
+    return added, skipped
@@ -0,0 +1,199 @@
+import base64
+import json
+import operator
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, select
+
+from app.extensions import db
+from app.models import User, UserStats, Word, WordList
+
+
+# sort -> (kolumn, fallande, kan vara NULL)
+WORD_SORTS = {
+    "alpha": (Word.original, False, False),
+    "hardest": (Word.wrong_count, True, True),
+    "recent_wrong": (Word.last_wrong, True, True),
+}
+
+LIST_SORTS = {
+    "name_asc": (WordList.name, False, False),
+    "name_desc": (WordList.name, True, False),
+    "words_desc": (WordList.word_count, True, False),
+    "words_asc": (WordList.word_count, False, False),
+    # Id följer skapelseordningen
+    "created_desc": (WordList.id, True, False),
+    "created_asc": (WordList.id, False, False),
+}
+
+# Adminlistan; räknarna kommer från user_stats. Raden skapas vid registrering
+# och migrering 6a2f9c1d8e35 fyllde i den för äldre användare; NULL-segmentet
+# i keyset_page finns kvar för säkerhets skull.
+USER_SORTS = {
+    "newest": (User.id, True, False),
+    "username": (User.username, False, False),
+    "words": (UserStats.word_count, True, True),
+    "lists": (UserStats.list_count, True, True),
+    "quizzes": (UserStats.quiz_count, True, True),
+    "last_active": (UserStats.last_active_day, True, True),
+}
+
+
+class InvalidCursor(ValueError):
+    """Markören i ?after= går inte att avkoda eller passar inte sorteringen."""
+
+
+def encode_cursor(value, row_id):
+    """Ogenomskinlig markör för "fortsätt efter (value, id)"."""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    elif isinstance(value, date):
+        value = {"d": value.isoformat()}
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Motsatsen till encode_cursor. Tom markör ger None (första sidan); allt
+    som inte är [skalär, heltal] eller ett kodat datum kastar InvalidCursor.
+    """
+    if not token:
+        return None
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if isinstance(value, dict):
+            value = date.fromisoformat(value["d"]) if "d" in value else datetime.fromisoformat(value["dt"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor("Ogiltig markör.") from exc
+
+    # bool är en int i Python men aldrig ett id eller ett sorteringsvärde
+    if type(row_id) is not int or isinstance(value, bool):
+        raise InvalidCursor("Ogiltig markör.")
+    if value is not None and not isinstance(value, (str, int, float, date)):
+        raise InvalidCursor("Ogiltig markör.")
+    return value, row_id
+
+
+def _check_cursor(col, value):
+    # Värdet jämförs mot kolumnen i SQL; fel typ ger annars ett databasfel
+    if value is None:
+        return
+    expected = col.type.python_type
+    if expected is float:
+        expected = (int, float)
+    if not isinstance(value, expected):
+        raise InvalidCursor("Markören passar inte sorteringen.")
+
+
+def _like(q):
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def keyset_page(stmt, sort, id_col, after=None, limit=50):
+    """
+    En sida ur stmt sorterad på (kolumn, id) med keyset-paginering.
+
+    NULL-värden läggs alltid sist, som ett eget segment sorterat på id. Så
+    kan båda segmenten gå på ett vanligt (…, kolumn)-index utan NULLS LAST,
+    som SQLite inte har. Returnerar (rader, markör för nästa sida eller None).
+    """
+
+    col, descending, nullable = sort
+    if after is not None:
+        _check_cursor(col, after[0])
+    cmp = operator.lt if descending else operator.gt
+    id_order = id_col.desc() if descending else id_col.asc()
+
+    rows = []
+    if after is None or after[0] is not None:
+        page = stmt.where(col.is_not(None)) if nullable else stmt
+        if after is not None:
+            value, row_id = after
+            page = page.where(or_(cmp(col, value), and_(col == value, cmp(id_col, row_id))))
+        page = page.order_by(col.desc() if descending else col.asc(), id_order)
+        rows = db.session.execute(page.limit(limit + 1)).all()
+
+    if nullable and len(rows) <= limit:
+        page = stmt.where(col.is_(None))
+        if after is not None and after[0] is None:
+            page = page.where(cmp(id_col, after[1]))
+        rows += db.session.execute(page.order_by(id_order).limit(limit + 1 - len(rows))).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, col.key), getattr(last, id_col.key))
+
+
+def word_page(list_id, sort="alpha", q="", after=None, limit=50):
+    """En sida ord i en lista, med sortering och textfilter på original/översättning."""
+    stmt = select(
+        Word.id,
+        Word.original,
+        Word.translation,
+        Word.correct_count,
+        Word.wrong_count,
+        Word.last_wrong,
+    ).where(Word.list_id == list_id)
+
+    q = (q or "").strip()
+    if q:
+        pattern = _like(q)
+        stmt = stmt.where(or_(
+            Word.original.ilike(pattern, escape="\\"),
+            Word.translation.ilike(pattern, escape="\\"),
+        ))
+
+    return keyset_page(stmt, WORD_SORTS.get(sort, WORD_SORTS["alpha"]), Word.id, decode_cursor(after), limit)
+
+
+def list_page(user_id, sort="name_asc", q="", after=None, limit=30):
+    """En sida av användarens ordlistor, med sortering och namnfilter."""
+    stmt = select(WordList.id, WordList.name, WordList.word_count).where(WordList.user_id == user_id)
+
+    q = (q or "").strip()
+    if q:
+        stmt = stmt.where(WordList.name.ilike(_like(q), escape="\\"))
+
+    return keyset_page(stmt, LIST_SORTS.get(sort, LIST_SORTS["name_asc"]), WordList.id, decode_cursor(after), limit)
+
+
+def users_stmt(q=""):
+    """
+    Alla användare med listor, ord, förhör och senaste aktivitet i en fråga:
+    users LEFT JOIN user_stats, utan en räknefråga per användare.
+    """
+
+    stmt = (
+        select(
+            User.id,
+            User.username,
+            User.email,
+            UserStats.list_count,
+            UserStats.word_count,
+            UserStats.quiz_count,
+            UserStats.last_active_day,
+        )
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+    )
+
+    q = (q or "").strip()
+    if q:
+        pattern = _like(q)
+        stmt = stmt.where(or_(
+            User.username.ilike(pattern, escape="\\"),
+            User.email.ilike(pattern, escape="\\"),
+        ))
+
+    return stmt
+
+
+def user_page(sort="newest", q="", after=None, limit=50):
+    """En sida av adminlistan över användare, keyset-paginerad på vald sortering."""
+    return keyset_page(
+        users_stmt(q), USER_SORTS.get(sort, USER_SORTS["newest"]), User.id, decode_cursor(after), limit
+    )
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from sqlalchemy import case, func, insert, update
+
+from app.extensions import db
+from app.models import Word, WordList, QuizAnswerLog
+from app.services.scheduler import schedule_updates
+
+
+def save_quiz_answers(user_id, quiz_result_id, answer_list, now=None):
+    """
+    Sparar alla svar i ett förhör med ett fast antal satser.
+
+    1. En fråga som hämtar de besvarade orden som tillhör användaren
+       (plus deras repetitionsschema).
+    2. En UPDATE som räknar upp correct_count/wrong_count atomärt i SQL
+       och skriver nytt schema, med CASE per ord-id.
+    3. En flerradig INSERT av alla svar i quiz_answer_log.
+
+    Returnerar {word_id: (rätt, fel)} för de ord som faktiskt uppdaterades.
+    """
+
+    now = now or datetime.utcnow()
+
+    # Bara objekt med heltals-id (inte bool, som också är int), som batch._id
+    answer_list = [a for a in answer_list if isinstance(a, dict) and type(a.get("id")) is int]
+    word_ids = {a["id"] for a in answer_list}
+    if not word_ids:
+        return {}
+
+    rows = (
+        db.session.query(Word.id, Word.repetitions, Word.interval_days, Word.ease)
+        .join(WordList, Word.list_id == WordList.id)
+        .filter(WordList.user_id == user_id, Word.id.in_(word_ids))
+        .all()
+    )
+    states = {r[0]: (r[1], r[2], r[3]) for r in rows}
+
+    deltas = {}
+    outcomes = {}
+    log_rows = []
+
+    for a in answer_list:
+        word_id = a["id"]
+        if word_id not in states:
+            continue  # defensivt, okänt eller någon annans ord
+
+        is_correct = bool(a.get("correct"))
+        dc, dw = deltas.get(word_id, (0, 0))
+        deltas[word_id] = (dc + 1, dw) if is_correct else (dc, dw + 1)
+        outcomes.setdefault(word_id, []).append(is_correct)
+
+        log_rows.append({
+            "user_id": user_id,
+            "quiz_result_id": quiz_result_id,
+            "word_id": word_id,
+            "user_answer": str(a.get("user_answer", ""))[:255],
+            "is_correct": is_correct,
+            "timestamp": now,
+        })
+
+    if not deltas:
+        return {}
+
+    schedule = {r["id"]: r for r in schedule_updates(states, outcomes, now)}
+    wrong_ids = [word_id for word_id, (_, dw) in deltas.items() if dw]
+
+    def per_word(values, else_):
+        return case(values, value=Word.id, else_=else_)
+
+    values = {
+        "correct_count": func.coalesce(Word.correct_count, 0)
+        + per_word({i: d[0] for i, d in deltas.items()}, 0),
+        "wrong_count": func.coalesce(Word.wrong_count, 0)
+        + per_word({i: d[1] for i, d in deltas.items()}, 0),
+        "next_due": per_word({i: s["next_due"] for i, s in schedule.items()}, Word.next_due),
+        "interval_days": per_word({i: s["interval_days"] for i, s in schedule.items()}, Word.interval_days),
+        "ease": per_word({i: s["ease"] for i, s in schedule.items()}, Word.ease),
+        "repetitions": per_word({i: s["repetitions"] for i, s in schedule.items()}, Word.repetitions),
+    }
+    if wrong_ids:
+        values["last_wrong"] = per_word({i: now for i in wrong_ids}, Word.last_wrong)
+
+    db.session.execute(
+        update(Word)
+        .where(Word.id.in_(list(deltas)))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    # .values(lista) ger en enda INSERT ... VALUES (...), (...). Med
+    # execute(insert(...), lista) kör pg8000 i stället en INSERT per svar.
+    db.session.execute(insert(QuizAnswerLog).values(log_rows))
+
+    return deltas
@@ -0,0 +1,158 @@
+import base64
+import json
+from collections import Counter
+
+from sqlalchemy import and_, delete, false, func, select, tuple_, update
+
+from app.extensions import db
+from app.models import QuizAnswerLog, Word, WordList
+from app.services.rollups import bump_list_word_counts, bump_users_word_count, unrecord_answer_logs
+
+
+PAGE_SIZE = 50
+
+# Max antal grupper per bulk-åtgärd
+MAX_GROUPS = 1000
+
+# Samma uttryck som det partiella indexet ix_word_pending_norm
+norm_original = func.lower(Word.original)
+norm_translation = func.lower(Word.translation)
+
+
+def _pending():
+    return Word.is_global == false()
+
+
+def _in_groups(keys):
+    return and_(_pending(), tuple_(norm_original, norm_translation).in_(keys))
+
+
+def encode_group_cursor(key):
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_group_cursor(token):
+    if not token:
+        return None
+    try:
+        original, translation = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return str(original), str(translation)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_group_keys(values):
+    """
+    Gruppnycklar från formuläret (JSON ["original", "translation"]). Värdena är
+    redan normaliserade av databasens lower(), som inte alltid är samma som
+    Pythons (SQLite sänker bara ASCII), så de används som de är.
+    """
+    keys = set()
+    for value in values[:MAX_GROUPS]:
+        try:
+            original, translation = json.loads(value)
+        except (ValueError, TypeError):
+            continue
+        if isinstance(original, str) and isinstance(translation, str):
+            keys.add((original, translation))
+    return list(keys)
+
+
+def pending_count():
+    """Antal ord som väntar på granskning (räknas på det partiella indexet)."""
+    return db.session.scalar(select(func.count()).select_from(Word).where(_pending()))
+
+
+def review_page(after=None, limit=PAGE_SIZE):
+    """
+    En sida av granskningskön, grupperad på (lower(original), lower(translation)).
+
+    Grupperna läses i indexordning med keyset-paginering, så varje sida kostar
+    lika mycket oavsett hur långt in i kön man är. Returnerar (grupper, nästa markör).
+    """
+
+    stmt = (
+        select(
+            norm_original.label("norm_original"),
+            norm_translation.label("norm_translation"),
+            func.min(Word.original).label("original"),
+            func.min(Word.translation).label("translation"),
+            func.count().label("count"),
+            func.count(func.distinct(Word.list_id)).label("lists"),
+        )
+        .where(_pending())
+        .group_by(norm_original, norm_translation)
+        .order_by(norm_original, norm_translation)
+        .limit(limit + 1)
+    )
+
+    after = decode_group_cursor(after)
+    if after is not None:
+        stmt = stmt.where(tuple_(norm_original, norm_translation) > after)
+
+    groups = db.session.execute(stmt).all()
+    if len(groups) <= limit:
+        return groups, None
+
+    groups = groups[:limit]
+    last = groups[-1]
+    return groups, encode_group_cursor((last.norm_original, last.norm_translation))
+
+
+def approve_groups(keys):
+    """Godkänner alla väntande ord i grupperna med en UPDATE. Returnerar antal ord."""
+    if not keys:
+        return 0
+
+    return db.session.execute(
+        update(Word)
+        .where(_in_groups(keys))
+        .values(is_global=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def reject_groups(keys):
+    """
+    Tar bort alla väntande ord i grupperna, med deras svarsloggar.
+
+    En GROUP BY per lista ger räknarna, sedan två DELETE och en UPDATE var
+    för listornas och användarnas word_count. Loggarnas rätt/fel dras av med
+    unrecord_answer_logs. Anroparen committar.
+    Returnerar (antal ord, berörda list-id, berörda användar-id).
+    """
+
+    if not keys:
+        return 0, set(), set()
+
+    per_list = db.session.execute(
+        select(Word.list_id, WordList.user_id, func.count())
+        .join(WordList, Word.list_id == WordList.id)
+        .where(_in_groups(keys))
+        .group_by(Word.list_id, WordList.user_id)
+    ).all()
+    if not per_list:
+        return 0, set(), set()
+
+    logs = QuizAnswerLog.word_id.in_(select(Word.id).where(_in_groups(keys)))
+    unrecord_answer_logs(logs)
+    db.session.execute(
+        delete(QuizAnswerLog)
+        .where(logs)
+        .execution_options(synchronize_session=False)
+    )
+    removed = db.session.execute(
+        delete(Word)
+        .where(_in_groups(keys))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    user_deltas = Counter()
+    for list_id, user_id, count in per_list:
+        user_deltas[user_id] -= count
+
+    bump_list_word_counts({list_id: -count for list_id, _, count in per_list})
+    bump_users_word_count(user_deltas)
+
+    return removed, {r[0] for r in per_list}, {r[1] for r in per_list if r[1] is not None}
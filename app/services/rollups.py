@@ -0,0 +1,360 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, case, delete, exists, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models import DailyAnswerStat, QuizAnswerLog, QuizResult, UserStats, Word, WordList
+
+
+def upsert(model):
+    """INSERT med ON CONFLICT-stöd för den databas vi kör mot (Postgres/SQLite)."""
+    if db.session.get_bind().dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def streaks(days):
+    """
+    (längd på sista sviten, längsta svit) för en sorterad lista av dagar.
+    Den enda streakdefinitionen: används av rebuild_user_stats och
+    analytics.get_daily_streaks.
+    """
+    if not days:
+        return 0, 0
+
+    longest = current = 1
+    for prev, curr in zip(days, days[1:]):
+        if curr == prev + timedelta(days=1):
+            current += 1
+            longest = max(longest, current)
+        else:
+            current = 1
+
+    return current, longest
+
+
+# ------------------------------------------------------
+# SKRIVVÄGAR – anropas före commit i samma transaktion
+# ------------------------------------------------------
+
+def bump_user_stats(user_id, **deltas):
+    """
+    Räknar upp/ner räknarna atomärt, t.ex. bump_user_stats(uid, word_count=1).
+
+    data_version räknas alltid upp, så bump_user_stats(uid) utan deltan
+    räcker för skrivningar som inte påverkar några räknare.
+    Saknas raden gör vi ingenting: den byggs då från grunden vid nästa läsning.
+    """
+
+    values = {
+        name: getattr(UserStats, name) + delta
+        for name, delta in deltas.items()
+        if delta
+    }
+    values["data_version"] = UserStats.data_version + 1
+
+    db.session.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_list_word_count(list_id, delta):
+    """Räknar upp/ner word_list.word_count atomärt."""
+    if delta:
+        db.session.execute(
+            update(WordList)
+            .where(WordList.id == list_id)
+            .values(word_count=WordList.word_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def bump_list_word_counts(deltas):
+    """Som bump_list_word_count men för många listor i en UPDATE: {list_id: delta}."""
+    deltas = {list_id: d for list_id, d in deltas.items() if d}
+    if deltas:
+        db.session.execute(
+            update(WordList)
+            .where(WordList.id.in_(list(deltas)))
+            .values(word_count=WordList.word_count + case(deltas, value=WordList.id, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def bump_users_word_count(deltas):
+    """Räknar upp/ner user_stats.word_count för många användare i en UPDATE: {user_id: delta}."""
+    deltas = {user_id: d for user_id, d in deltas.items() if user_id is not None and d}
+    if deltas:
+        db.session.execute(
+            update(UserStats)
+            .where(UserStats.user_id.in_(list(deltas)))
+            .values(
+                word_count=UserStats.word_count + case(deltas, value=UserStats.user_id, else_=0),
+                data_version=UserStats.data_version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reconcile_word_counts():
+    """
+    Sätter word_list.word_count till det faktiska antalet ord.
+
+    Returnerar antal listor som var fel.
+    """
+
+    actual = (
+        select(func.count(Word.id))
+        .where(Word.list_id == WordList.id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(WordList)
+        .where(WordList.word_count != actual)
+        .values(word_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def record_quiz_stats(user_id, correct, wrong, day=None):
+    """Ett avslutat förhör: räknare + dagsstreak i en UPDATE."""
+    day = day or datetime.utcnow().date()
+
+    current = case(
+        (UserStats.last_active_day == day, UserStats.current_streak),
+        (UserStats.last_active_day == day - timedelta(days=1), UserStats.current_streak + 1),
+        else_=1,
+    )
+
+    db.session.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            quiz_count=UserStats.quiz_count + 1,
+            total_correct=UserStats.total_correct + correct,
+            total_wrong=UserStats.total_wrong + wrong,
+            current_streak=current,
+            best_streak=case(
+                (current > UserStats.best_streak, current),
+                else_=UserStats.best_streak,
+            ),
+            last_active_day=day,
+            data_version=UserStats.data_version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def record_daily_answers(user_id, correct, wrong, day=None):
+    """Upsertar dagens rad i daily_answer_stats."""
+    if not correct and not wrong:
+        return
+
+    day = day or datetime.utcnow().date()
+    stmt = upsert(DailyAnswerStat).values(
+        user_id=user_id, day=day, correct=correct, wrong=wrong
+    )
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "day"],
+            set_={
+                "correct": DailyAnswerStat.correct + stmt.excluded.correct,
+                "wrong": DailyAnswerStat.wrong + stmt.excluded.wrong,
+            },
+        )
+    )
+
+
+def unrecord_answer_logs(condition):
+    """
+    Drar av svarsloggarna som matchar condition (ett villkor på QuizAnswerLog)
+    från user_stats.total_correct/total_wrong och daily_answer_stats, så att
+    räknarna stämmer med rebuild_user_stats/backfill_daily_stats efter att
+    loggarna tagits bort. Anropas före DELETE, i samma transaktion.
+
+    En GROUP BY per användare, en UPDATE av user_stats, en UPDATE och en
+    DELETE av dagsraderna.
+    """
+
+    correct = func.coalesce(func.sum(case((QuizAnswerLog.is_correct, 1), else_=0)), 0)
+    wrong = func.coalesce(func.sum(case((QuizAnswerLog.is_correct, 0), else_=1)), 0)
+
+    per_user = db.session.execute(
+        select(QuizAnswerLog.user_id, correct, wrong)
+        .where(condition)
+        .group_by(QuizAnswerLog.user_id)
+    ).all()
+    if not per_user:
+        return
+
+    user_ids = [r[0] for r in per_user]
+    db.session.execute(
+        update(UserStats)
+        .where(UserStats.user_id.in_(user_ids))
+        .values(
+            total_correct=UserStats.total_correct - case({r[0]: r[1] for r in per_user}, value=UserStats.user_id, else_=0),
+            total_wrong=UserStats.total_wrong - case({r[0]: r[2] for r in per_user}, value=UserStats.user_id, else_=0),
+            data_version=UserStats.data_version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # Samma dagsgräns som backfill_daily_stats: date(timestamp)
+    same_day = and_(
+        condition,
+        QuizAnswerLog.user_id == DailyAnswerStat.user_id,
+        func.date(QuizAnswerLog.timestamp) == DailyAnswerStat.day,
+    )
+    db.session.execute(
+        update(DailyAnswerStat)
+        .where(DailyAnswerStat.user_id.in_(user_ids), exists().where(same_day))
+        .values(
+            correct=DailyAnswerStat.correct - select(correct).where(same_day).scalar_subquery(),
+            wrong=DailyAnswerStat.wrong - select(wrong).where(same_day).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        delete(DailyAnswerStat)
+        .where(
+            DailyAnswerStat.user_id.in_(user_ids),
+            DailyAnswerStat.correct <= 0,
+            DailyAnswerStat.wrong <= 0,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ------------------------------------------------------
+# LÄSNING / ÅTERUPPBYGGNAD
+# ------------------------------------------------------
+
+def rebuild_user_stats(user_id):
+    """Räknar om raden från källtabellerna (för nya rader och avstämning)."""
+    list_count = (
+        db.session.query(func.count(WordList.id))
+        .filter(WordList.user_id == user_id)
+        .scalar()
+    )
+    word_count = (
+        db.session.query(func.count(Word.id))
+        .join(WordList, Word.list_id == WordList.id)
+        .filter(WordList.user_id == user_id)
+        .scalar()
+    )
+    quiz_count = (
+        db.session.query(func.count(QuizResult.id))
+        .filter(QuizResult.user_id == user_id)
+        .scalar()
+    )
+    total_correct, total_wrong = (
+        db.session.query(
+            func.coalesce(func.sum(case((QuizAnswerLog.is_correct, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((QuizAnswerLog.is_correct, 0), else_=1)), 0),
+        )
+        .filter(QuizAnswerLog.user_id == user_id)
+        .one()
+    )
+
+    day_rows = (
+        db.session.query(func.date(QuizAnswerLog.timestamp))
+        .filter(QuizAnswerLog.user_id == user_id)
+        .distinct()
+        .all()
+    )
+    days = sorted(_as_date(r[0]) for r in day_rows if r[0] is not None)
+    current, best = streaks(days)
+
+    values = {
+        "word_count": word_count,
+        "list_count": list_count,
+        "quiz_count": quiz_count,
+        "total_correct": int(total_correct),
+        "total_wrong": int(total_wrong),
+        "current_streak": current,
+        "best_streak": best,
+        "last_active_day": days[-1] if days else None,
+    }
+
+    stmt = upsert(UserStats).values(user_id=user_id, **values)
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={**values, "data_version": UserStats.data_version + 1},
+        )
+    )
+
+
+def get_user_stats(user_id):
+    """
+    Läser användarens rollup-rad, bygger den först om den saknas. Raden
+    flushas bara; det är anropande route som committar.
+    """
+    stats = db.session.get(UserStats, user_id)
+
+    if stats is None:
+        rebuild_user_stats(user_id)
+        db.session.flush()
+        stats = db.session.get(UserStats, user_id)
+
+    return stats
+
+
+def current_data_version(user_id):
+    """
+    Användarens data_version, nyckel för processcacher som måste följa
+    skrivningar i andra workers. Raden byggs först om den saknas, annars
+    skulle skrivvägarna inte räkna upp versionen.
+    """
+
+    version = db.session.scalar(
+        select(UserStats.data_version).where(UserStats.user_id == user_id)
+    )
+    if version is None:
+        version = get_user_stats(user_id).data_version
+    return version
+
+
+def backfill_daily_stats(user_id=None):
+    """
+    Bygger om daily_answer_stats från quiz_answer_log med en INSERT ... SELECT.
+
+    Returnerar antal skrivna rader.
+    """
+
+    clear = delete(DailyAnswerStat)
+    source = (
+        select(
+            QuizAnswerLog.user_id,
+            func.date(QuizAnswerLog.timestamp),
+            func.sum(case((QuizAnswerLog.is_correct, 1), else_=0)),
+            func.sum(case((QuizAnswerLog.is_correct, 0), else_=1)),
+        )
+        .where(QuizAnswerLog.timestamp.isnot(None))
+        .group_by(QuizAnswerLog.user_id, func.date(QuizAnswerLog.timestamp))
+    )
+    if user_id is not None:
+        clear = clear.where(DailyAnswerStat.user_id == user_id)
+        source = source.where(QuizAnswerLog.user_id == user_id)
+
+    db.session.execute(clear)
+    result = db.session.execute(
+        insert(DailyAnswerStat).from_select(
+            ["user_id", "day", "correct", "wrong"], source
+        )
+    )
+    return result.rowcount
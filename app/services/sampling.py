@@ -0,0 +1,276 @@
+import random
+import threading
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Word, WordList
+from app.services.cache import LRUCache
+from app.services.rollups import current_data_version
+
+
+# user_id -> (data_version, {list_key: WordSampler}). Dicten ändras aldrig på
+# plats utan ersätts under _lock, så att trådar som läser den aldrig ser den växa.
+_samplers = LRUCache(maxsize=256, max_age=600)
+_lock = threading.Lock()
+
+# Listor med ett id-spann under detta slumpas med ORDER BY random()
+SMALL_LIST_SPAN = 2000
+
+
+def word_weights(correct, wrong):
+    """Vikt per ord: 1 om ordet sitter, annars 1 + log(1 + fel - rätt)."""
+    diff = np.asarray(wrong, dtype=np.float64) - np.asarray(correct, dtype=np.float64)
+    return np.where(diff <= 0, 1.0, 1.0 + np.log1p(np.maximum(diff, 0)))
+
+
+class AliasTable:
+    """Walkers alias-metod: O(n) att bygga, O(1) per dragning."""
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+
+        scaled = weights * (n / weights.sum())
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+
+        small = list(np.flatnonzero(scaled < 1.0))
+        large = list(np.flatnonzero(scaled >= 1.0))
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+    def draw(self, k, rng):
+        """Drar k index med återläggning."""
+        i = rng.integers(len(self.prob), size=k)
+        u = rng.random(k)
+        return np.where(u < self.prob[i], i, self.alias[i])
+
+
+class WordSampler:
+    """Viktad slump över en mängd ord, med vikter som uppdateras på plats."""
+
+    def __init__(self, ids, correct, wrong):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.correct = np.asarray(correct, dtype=np.int64)
+        self.wrong = np.asarray(wrong, dtype=np.int64)
+        self.position = {int(word_id): i for i, word_id in enumerate(self.ids)}
+
+        self.weights = word_weights(self.correct, self.wrong)
+        self._table = None
+        # Samma sampler delas av workerns trådar: dragning och uppdatering turas om
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = AliasTable(self.weights)
+        return self._table
+
+    def apply_results(self, deltas):
+        """
+        Uppdaterar räknarna för de ord som besvarats.
+
+        deltas: {word_id: (rätt, fel)}. Bara de berörda vikterna räknas om,
+        själva alias-tabellen byggs om först vid nästa dragning.
+        """
+
+        touched = [
+            (self.position[word_id], dc, dw)
+            for word_id, (dc, dw) in deltas.items()
+            if word_id in self.position
+        ]
+        if not touched:
+            return
+
+        idx = np.array([t[0] for t in touched])
+        with self._lock:
+            self.correct[idx] += np.array([t[1] for t in touched])
+            self.wrong[idx] += np.array([t[2] for t in touched])
+            self.weights[idx] = word_weights(self.correct[idx], self.wrong[idx])
+            self._table = None
+
+    def sample(self, k, unique=False, rng=None):
+        """Returnerar k ord-id:n, utan upprepningar om unique=True."""
+        rng = rng or np.random.default_rng()
+
+        with self._lock:
+            return self._sample(k, unique, rng)
+
+    def _sample(self, k, unique, rng):
+        if not unique:
+            return [int(x) for x in self.ids[self.table.draw(k, rng)]]
+
+        n = len(self.ids)
+        if k >= n:
+            return [int(x) for x in self.ids[rng.permutation(n)]]
+
+        # Alias-dragningar tills vi har k unika, annars exakt dragning
+        chosen = []
+        seen = set()
+        for _ in range(4):
+            for i in self.table.draw(2 * k, rng):
+                i = int(i)
+                if i not in seen:
+                    seen.add(i)
+                    chosen.append(i)
+                    if len(chosen) == k:
+                        return [int(self.ids[i]) for i in chosen]
+
+        p = self.weights / self.weights.sum()
+        picked = rng.choice(n, size=k, replace=False, p=p)
+        return [int(x) for x in self.ids[picked]]
+
+
+def get_word_sampler(user_id, list_ids=None):
+    """
+    Hämtar (eller bygger) samplern för användarens valda listor.
+
+    list_ids=None betyder alla användarens listor. Cachen gäller en
+    data_version; har någon worker skrivit sedan dess byggs samplern om.
+    """
+
+    list_key = "all" if list_ids is None else tuple(sorted(set(list_ids)))
+    version = current_data_version(user_id)
+
+    cached = _samplers.get(user_id)
+    if cached and cached[0] == version and list_key in cached[1]:
+        return cached[1][list_key]
+
+    query = (
+        db.session.query(Word.id, Word.correct_count, Word.wrong_count)
+        .join(WordList, Word.list_id == WordList.id)
+        .filter(WordList.user_id == user_id)
+    )
+    if list_ids is not None:
+        query = query.filter(Word.list_id.in_(list_key))
+
+    rows = query.all()
+    sampler = WordSampler(
+        [r[0] for r in rows],
+        [r[1] or 0 for r in rows],
+        [r[2] or 0 for r in rows],
+    )
+
+    with _lock:
+        cached = _samplers.get(user_id)
+        samplers = cached[1] if cached and cached[0] == version else {}
+        _samplers.set(user_id, (version, {**samplers, list_key: sampler}))
+
+    return sampler
+
+
+def record_word_results(user_id, deltas, version):
+    """
+    Anropas av quiz_finish efter commit, med data_version efter förhöret, så
+    att cachade vikter följer med räknarna. Var den cachade versionen precis
+    en före har ingen annan skrivit emellan; annars släpps samplerna.
+    """
+
+    with _lock:
+        cached = _samplers.get(user_id)
+        if not cached:
+            return
+
+        if version is None or cached[0] != version - 1:
+            _samplers.pop(user_id)
+            return
+
+        for sampler in cached[1].values():
+            sampler.apply_results(deltas)
+        _samplers.set(user_id, (version, cached[1]))
+
+
+def invalidate_samplers(user_id):
+    """
+    Anropas när användarens ord läggs till, ändras eller tas bort. Genväg i
+    den egna workern; övriga ser den nya data_version vid nästa läsning.
+    """
+    with _lock:
+        _samplers.pop(user_id)
+
+
+def sample_list_word_ids(list_id, n, rounds=3):
+    """
+    Slumpar upp till n unika ord-id:n ur en lista direkt i databasen.
+
+    Små listor (id-spann under SMALL_LIST_SPAN) använder ORDER BY random()
+    LIMIT n. Stora listor slumpar n punkter i listans id-spann och slår upp
+    närmaste id >= punkten via indexet (list_id, id), allt i en fråga per
+    runda. Ord efter stora id-luckor blir något vanligare, vilket är okej
+    för ett snabbförhör. Fungerar likadant på SQLite och Postgres.
+    """
+
+    lo, hi = (
+        db.session.query(func.min(Word.id), func.max(Word.id))
+        .filter(Word.list_id == list_id)
+        .one()
+    )
+    if lo is None:
+        return []
+
+    if hi - lo >= SMALL_LIST_SPAN:
+        chosen = []
+        for _ in range(rounds):
+            pivots = [random.randint(lo, hi) for _ in range(n)]
+            probes = [
+                select(func.min(Word.id))
+                .where(Word.list_id == list_id, Word.id >= pivot)
+                .scalar_subquery()
+                for pivot in pivots
+            ]
+            for word_id in db.session.execute(select(*probes)).one():
+                if word_id is not None and word_id not in chosen:
+                    chosen.append(word_id)
+                    if len(chosen) == n:
+                        return chosen
+
+    # Liten lista, eller för få träffar: låt databasen blanda
+    rows = (
+        db.session.query(Word.id)
+        .filter(Word.list_id == list_id)
+        .order_by(func.random())
+        .limit(n)
+        .all()
+    )
+    return [r[0] for r in rows]
+
+
+def todays_word(user_id, day):
+    """
+    Dagens ord: ett av användarens ord, samma hela dagen. Slumptalet seedas
+    med (användare, dag) och slås upp som i sample_list_word_ids, närmaste
+    id >= en punkt i id-spannet, utan att läsa alla ord.
+    """
+
+    owned = select(WordList.id).where(WordList.user_id == user_id)
+    lo, hi = (
+        db.session.query(func.min(Word.id), func.max(Word.id))
+        .filter(Word.list_id.in_(owned))
+        .one()
+    )
+    if lo is None:
+        return None
+
+    pivot = random.Random(f"{user_id}-{day.isoformat()}").randint(lo, hi)
+    return (
+        Word.query
+        .filter(Word.list_id.in_(owned), Word.id >= pivot)
+        .order_by(Word.id)
+        .first()
+    )
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Word, WordList
+
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# SM-2-kvalitet (0–5) för rätt respektive fel svar i ett förhör
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+def sm2(repetitions, interval_days, ease, quality):
+    """
+    Ett SM-2-steg. Returnerar (repetitions, interval_days, ease).
+
+    Fel svar (quality < 3) nollställer repetitionerna och ordet kommer
+    tillbaka nästa dag; rätt svar ger 1, 6 och sedan interval * ease dagar.
+    """
+
+    repetitions = repetitions or 0
+    interval_days = interval_days or 0
+    ease = ease or DEFAULT_EASE
+
+    if quality < 3:
+        repetitions = 0
+        interval_days = 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease, 2)
+
+    ease = ease + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    ease = max(MIN_EASE, round(ease, 3))
+
+    return repetitions, interval_days, ease
+
+
+def schedule_updates(states, outcomes, now=None):
+    """
+    Räknar fram nytt schema för alla besvarade ord.
+
+    states:   {word_id: (repetitions, interval_days, ease)}
+    outcomes: {word_id: [True, False, ...]} i den ordning de besvarades
+    Returnerar en lista av dicts redo för en bulk-UPDATE på primärnyckel.
+    """
+
+    now = now or datetime.utcnow()
+    rows = []
+
+    for word_id, answers in outcomes.items():
+        if word_id not in states:
+            continue
+
+        repetitions, interval_days, ease = states[word_id]
+        for is_correct in answers:
+            quality = QUALITY_CORRECT if is_correct else QUALITY_WRONG
+            repetitions, interval_days, ease = sm2(repetitions, interval_days, ease, quality)
+
+        rows.append({
+            "id": word_id,
+            "repetitions": repetitions,
+            "interval_days": interval_days,
+            "ease": ease,
+            "next_due": now + timedelta(days=interval_days),
+        })
+
+    return rows
+
+
+def due_word_ids(user_id, list_ids=None, limit=20, now=None):
+    """
+    De limit ord som förfallit längst tillbaka, via indexet (list_id, next_due).
+
+    Ord som inte är förfallna läses aldrig.
+    """
+
+    now = now or datetime.utcnow()
+
+    owned = select(WordList.id).where(WordList.user_id == user_id)
+    if list_ids is not None:
+        owned = owned.where(WordList.id.in_(list_ids))
+
+    rows = (
+        db.session.query(Word.id)
+        .filter(Word.list_id.in_(owned), Word.next_due <= now)
+        .order_by(Word.next_due.asc())
+        .limit(limit)
+        .all()
+    )
+    return [r[0] for r in rows]
@@ -0,0 +1,179 @@
+import re
+
+from sqlalchemy import case, column, func, literal, literal_column, or_, select, table, text
+
+from app.extensions import db
+from app.models import Word, WordList
+
+
+MAX_QUERY_LENGTH = 100
+
+# Ordprefix i sökfrågan, se _fts_query
+_token = re.compile(r"\w+", re.UNICODE)
+
+# FTS5-tabell för lokal SQLite, synkad med word via triggers.
+# remove_diacritics gör "cafe" och "café" lika, prefix-indexen gör "ca*" snabbt.
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS word_fts USING fts5(
+        original, translation,
+        content='word', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS word_fts_ai AFTER INSERT ON word BEGIN
+        INSERT INTO word_fts(rowid, original, translation)
+        VALUES (new.id, new.original, new.translation);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS word_fts_ad AFTER DELETE ON word BEGIN
+        INSERT INTO word_fts(word_fts, rowid, original, translation)
+        VALUES ('delete', old.id, old.original, old.translation);
+    END
+    """,
+    # Bara när texten ändras, inte vid varje räknaruppdatering efter förhör
+    """
+    CREATE TRIGGER IF NOT EXISTS word_fts_au AFTER UPDATE OF original, translation ON word BEGIN
+        INSERT INTO word_fts(word_fts, rowid, original, translation)
+        VALUES ('delete', old.id, old.original, old.translation);
+        INSERT INTO word_fts(rowid, original, translation)
+        VALUES (new.id, new.original, new.translation);
+    END
+    """,
+]
+
+_word_fts = table("word_fts", column("rowid"))
+
+
+def ensure_sqlite_search():
+    """Skapar FTS5-tabellen och triggrarna lokalt, och fyller tabellen första gången."""
+    created = not db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_fts'")
+    ).first()
+
+    for ddl in SQLITE_FTS_DDL:
+        db.session.execute(text(ddl))
+
+    if created:
+        db.session.execute(text("INSERT INTO word_fts(word_fts) VALUES ('rebuild')"))
+
+    db.session.commit()
+
+
+def _base(user_id):
+    return (
+        select(Word.id, Word.original, Word.translation, Word.list_id, WordList.name.label("list_name"))
+        .join(WordList, Word.list_id == WordList.id)
+        .where(WordList.user_id == user_id)
+    )
+
+
+def _normalized(value):
+    # Måste vara identiskt med indexuttrycken i migreringen för att GIN ska användas
+    return func.lower(func.immutable_unaccent(value))
+
+
+def _pg_search(user_id, q):
+    # % och _ i frågan ska matcha sig själva, både i delsträng och prefix
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    term = _normalized(literal(q))
+    pattern = _normalized(literal(f"%{escaped}%"))
+    prefix = _normalized(literal(f"{escaped}%"))
+    original = _normalized(Word.original)
+    translation = _normalized(Word.translation)
+
+    rank = case(
+        (or_(original == term, translation == term), 0),
+        (or_(original.like(prefix), translation.like(prefix)), 1),
+        else_=2,
+    )
+    similarity = func.greatest(func.similarity(original, term), func.similarity(translation, term))
+
+    return (
+        _base(user_id)
+        .where(or_(original.like(pattern), translation.like(pattern)))
+        .order_by(rank, similarity.desc(), Word.id)
+    )
+
+
+def _fts_query(q):
+    # Varje ord i frågan blir ett prefix: "hus bå" -> "hus"* "bå"*
+    return " ".join(f'"{t}"*' for t in _token.findall(q))
+
+
+def _sqlite_search(user_id, q):
+    """
+    FTS5 ger accentokänsliga ordprefix; delsträngar mitt i ord hittas med
+    LIKE över användarens ord (skiftlägesokänsligt bara för ASCII, och utan
+    accentfolding). Rankning: exakt > prefixträff i FTS > bara delsträng.
+    """
+
+    substring = or_(
+        Word.original.contains(q, autoescape=True),
+        Word.translation.contains(q, autoescape=True),
+    )
+
+    match = _fts_query(q)
+    if not match:
+        # T.ex. bara skiljetecken: inga ord att söka på i FTS
+        return _base(user_id).where(substring).order_by(Word.original, Word.id)
+
+    fts = (
+        select(_word_fts.c.rowid, func.bm25(literal_column("word_fts")).label("score"))
+        .where(literal_column("word_fts").op("MATCH")(match))
+        .subquery()
+    )
+
+    lowered = q.lower()
+    rank = case(
+        (or_(func.lower(Word.original) == lowered, func.lower(Word.translation) == lowered), 0),
+        (fts.c.rowid.is_not(None), 1),
+        else_=2,
+    )
+
+    return (
+        _base(user_id)
+        .outerjoin(fts, fts.c.rowid == Word.id)
+        .where(or_(fts.c.rowid.is_not(None), substring))
+        .order_by(rank, fts.c.score, Word.id)
+    )
+
+
+def _like_search(user_id, q):
+    return (
+        _base(user_id)
+        .where(or_(
+            Word.original.icontains(q, autoescape=True),
+            Word.translation.icontains(q, autoescape=True),
+        ))
+        .order_by(Word.original, Word.id)
+    )
+
+
+def search_words(user_id, q, limit=20, offset=0):
+    """
+    Söker i användarens alla ord på original och översättning.
+
+    Postgres: prefix, delsträng och accentokänsligt via pg_trgm-index på
+    lower(immutable_unaccent(...)), rankat exakt > prefix > delsträng och
+    sedan trigramlikhet. SQLite: FTS5 med accentokänsliga ordprefix, plus
+    delsträngar via LIKE (se _sqlite_search). Returnerar (träffar, finns fler).
+    """
+
+    q = (q or "").strip()[:MAX_QUERY_LENGTH]
+    if not q:
+        return [], False
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = _pg_search(user_id, q)
+    elif dialect == "sqlite":
+        stmt = _sqlite_search(user_id, q)
+    else:
+        stmt = _like_search(user_id, q)
+
+    rows = db.session.execute(stmt.limit(limit + 1).offset(offset)).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,86 @@
+from sqlalchemy import insert, literal, select
+
+from app.extensions import db
+from app.models import ListShare, User, Word, WordList
+from app.services.rollups import bump_list_word_count, bump_user_stats
+
+
+def copy_list(src_list_id, user_id, name):
+    """
+    Kopierar alla ord i en lista till en ny lista för user_id med en enda
+    INSERT INTO word (...) SELECT ... FROM word WHERE list_id = :src.
+
+    Räknare och repetitionsschema börjar om (kolumnernas standardvärden).
+    Anroparen committar. Returnerar (ny lista, antal kopierade ord).
+    """
+
+    wl = WordList(name=name[:120], user_id=user_id, word_count=0)
+    db.session.add(wl)
+    db.session.flush()
+
+    rows = (
+        select(Word.original, Word.translation, literal(wl.id))
+        .where(Word.list_id == src_list_id)
+        .order_by(Word.id)
+    )
+    copied = db.session.execute(
+        insert(Word).from_select(["original", "translation", "list_id"], rows)
+    ).rowcount
+
+    bump_list_word_count(wl.id, copied)
+    bump_user_stats(user_id, list_count=1, word_count=copied)
+
+    return wl, copied
+
+
+def share_list(wordlist, identifier):
+    """
+    Delar en lista med användaren med angiven e-post eller användarnamn.
+    Returnerar (ListShare eller None, felmeddelande eller None).
+    """
+
+    recipient = User.find_by_identifier((identifier or "").strip())
+    if recipient is None:
+        return None, "Hittade ingen användare med den adressen."
+    if recipient.id == wordlist.user_id:
+        return None, "Du kan inte dela en lista med dig själv."
+
+    share = ListShare.query.filter_by(list_id=wordlist.id, recipient_id=recipient.id).first()
+    if share is None:
+        share = ListShare(list_id=wordlist.id, recipient_id=recipient.id)
+        db.session.add(share)
+
+    return share, None
+
+
+def shared_lists(user_id):
+    """Listor som delats med user_id: (share_id, list_id, namn, antal ord, ägare)."""
+    return db.session.execute(
+        select(
+            ListShare.id.label("share_id"),
+            WordList.id.label("list_id"),
+            WordList.name,
+            WordList.word_count,
+            User.username.label("owner"),
+        )
+        .join(WordList, ListShare.list_id == WordList.id)
+        .join(User, WordList.user_id == User.id)
+        .where(ListShare.recipient_id == user_id)
+        .order_by(WordList.name, ListShare.id)
+    ).all()
+
+
+def get_share(share_id, user_id):
+    """Delningen om den tillhör user_id som mottagare, annars None."""
+    return ListShare.query.filter_by(id=share_id, recipient_id=user_id).first()
+
+
+def import_shared_list(share):
+    """
+    Gör om en delad lista till mottagarens egen kopia (t.ex. när mottagaren
+    vill redigera) och tar bort delningen. Anroparen committar.
+    """
+
+    wl, copied = copy_list(share.list_id, share.recipient_id, share.word_list.name)
+    db.session.delete(share)
+    return wl, copied
@@ -1,67 +1,181 @@
-from flask import render_template
+from datetime import datetime, timedelta
+
+from flask import render_template, request, jsonify
 from flask_login import login_required, current_user
 
+from app.extensions import db
 from app.stats import stats_bp
-from app.models import QuizResult, WordList, Word
+from app.services.analytics import get_daily_streaks, get_quiz_history, get_quiz_series, get_top_wrong_words
+from app.services.cache import LRUCache, conditional_render
+from app.services.exporter import FORMATS, export_response, history_rows
+from app.services.rollups import get_user_stats
+
+
+# (user_id, widget, params) -> (data_version, payload)
+_widget_cache = LRUCache(maxsize=2048)
+
+NO_CACHE = "private, no-cache"
+PAST_RANGE = "private, max-age=3600"
+
+
+def _parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def _widget(name, params, build, cache_control=NO_CACHE, stats=None):
+    """
+    Gemensam ram för widget-endpoints: ETag på användarens data_version och
+    parametrarna, och en processcache så att 200-svar inte räknas om i onödan.
+    """
+
+    if stats is None:
+        stats = get_user_stats(current_user.id)
+        db.session.commit()
+    key = (current_user.id, name, params)
+    etag = "-".join([name, str(current_user.id), str(stats.data_version)] + [str(p) for p in params])
+
+    def render():
+        cached = _widget_cache.get(key)
+        if cached and cached[0] == stats.data_version:
+            payload = cached[1]
+        else:
+            payload = build(stats)
+            _widget_cache.set(key, (stats.data_version, payload))
+        return jsonify(payload)
+
+    return conditional_render(etag, render, cache_control=cache_control)
 
 
 @stats_bp.route("/")
 @login_required
 def stats_page():
-    """Visar statistiksidan (stats.html)."""
-
-    # --- Totaler ---
-    total_lists = (
-        WordList.query.filter_by(user_id=current_user.id).count()
-    )
-
-    total_words = (
-        Word.query
-        .join(WordList)
-        .filter(WordList.user_id == current_user.id)
-        .count()
-    )
-
-    total_quizzes = (
-        QuizResult.query.filter_by(user_id=current_user.id).count()
-    )
-
-    # --- Resultat över tid ---
-    quiz_results = (
-        QuizResult.query
-        .filter_by(user_id=current_user.id)
-        .order_by(QuizResult.date.asc())
-        .all()
-    )
-
-    quiz_scores = [r.correct_count for r in quiz_results]
-    quiz_labels = [r.date.strftime("%Y-%m-%d") for r in quiz_results]
-
-    # --- Svåraste ord ---
-    hardest_words = (
-        Word.query
-        .join(WordList)
-        .filter(WordList.user_id == current_user.id)
-        .filter(Word.wrong_count > 0)
-        .order_by(Word.wrong_count.desc())
-        .limit(10)
-        .all()
-    )
-
-    streak_info = {
-    "current": 0,
-    "best": 0
-}
-
-    # Rendera template
-    return render_template(
-        "stats/stats.html",
-        total_lists=total_lists,
-        total_words=total_words,
-        total_quizzes=total_quizzes,
-        quiz_scores=quiz_scores,
-        quiz_labels=quiz_labels,
-        hardest_words=hardest_words,
-        user=current_user,   # så du kan använda {{ user.username }} i HTML
-        streak_info=streak_info
-    )
+    """Visar statistiksidan (stats.html); widgetarna hämtas parallellt från /stats/api/*."""
+    return render_template("stats/stats.html", user=current_user)
+
+
+# ------------------------------------------------------
+# JSON-ENDPOINTS PER WIDGET
+# ------------------------------------------------------
+
+@stats_bp.route("/api/totals")
+@login_required
+def api_totals():
+    """Totaler från user_stats."""
+    def build(stats):
+        return {
+            "total_lists": stats.list_count,
+            "total_words": stats.word_count,
+            "total_quizzes": stats.quiz_count,
+            "total_correct": stats.total_correct,
+            "total_wrong": stats.total_wrong,
+        }
+
+    return _widget("totals", (), build)
+
+
+@stats_bp.route("/api/history")
+@login_required
+def api_history():
+    """
+    Resultat över tid. Parametrar: bucket (auto/raw/day/week/month),
+    points (max antal punkter), from/to (YYYY-MM-DD, to är inklusive).
+    """
+
+    bucket = request.args.get("bucket", "auto")
+    if bucket not in ("auto", "raw", "day", "week", "month"):
+        bucket = "auto"
+    points = min(max(request.args.get("points", type=int, default=60), 3), 500)
+    start = request.args.get("from", type=_parse_day)
+    end = request.args.get("to", type=_parse_day)
+
+    def build(stats):
+        series = get_quiz_series(
+            current_user.id,
+            bucket=bucket,
+            target_points=points,
+            start=start,
+            end=end + timedelta(days=1) if end else None,
+        )
+        return {
+            "labels": [p["date"].strftime("%Y-%m-%d") for p in series],
+            "scores": [p["score"] for p in series],
+            "quizzes": [p["quizzes"] for p in series],
+        }
+
+    # Ett intervall som helt ligger bakåt i tiden ändras inte längre
+    today = datetime.utcnow().date()
+    cache_control = PAST_RANGE if end and end.date() < today else NO_CACHE
+
+    params = (bucket, points, start.date() if start else "", end.date() if end else "")
+    return _widget("history", params, build, cache_control)
+
+
+@stats_bp.route("/api/daily")
+@login_required
+def api_daily():
+    """Rätt och fel per dag de senaste days dagarna (standard 30), ur daily_answer_stats."""
+    days = min(max(request.args.get("days", type=int, default=30), 1), 365)
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+
+    def build(stats):
+        return {"days": get_quiz_history(current_user.id, start=start)}
+
+    return _widget("daily", (days, today.isoformat()), build)
+
+
+@stats_bp.route("/api/hardest")
+@login_required
+def api_hardest():
+    """Svåraste orden, sidvis med limit/offset."""
+    limit = min(max(request.args.get("limit", type=int, default=10), 1), 50)
+    offset = max(request.args.get("offset", type=int, default=0), 0)
+
+    def build(stats):
+        words = get_top_wrong_words(current_user.id, limit=limit + 1, offset=offset)
+        return {
+            "words": [
+                {
+                    "original": w.original,
+                    "translation": w.translation,
+                    "wrong": w.wrong_count or 0,
+                    "correct": w.correct_count or 0,
+                    "last_wrong": w.last_wrong.strftime("%Y-%m-%d") if w.last_wrong else None,
+                }
+                for w in words[:limit]
+            ],
+            "offset": offset,
+            "limit": limit,
+            "has_more": len(words) > limit,
+        }
+
+    return _widget("hardest", (limit, offset), build)
+
+
+@stats_bp.route("/api/streaks")
+@login_required
+def api_streaks():
+    """Nuvarande och längsta dagsstreak, ur daily_answer_stats."""
+    # Streaken beror på dagens datum, därför ingår det i ETaggen
+    today = datetime.utcnow().date()
+
+    def build(stats):
+        return get_daily_streaks(current_user.id, today)
+
+    return _widget("streaks", (today.isoformat(),), build)
+
+
+# ------------------------------------------------------
+# EXPORT AV SVARSHISTORIK
+# ------------------------------------------------------
+
+@stats_bp.route("/export/history")
+@login_required
+def export_history():
+    """Alla svar som CSV, JSONL eller XLSX (format=...), gzip=1 komprimerar."""
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        fmt = "csv"
+
+    columns, rows = history_rows(current_user.id)
+    return export_response(columns, rows, fmt, "svarshistorik", gzip=request.args.get("gzip") == "1")
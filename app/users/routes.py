@@ -2,40 +2,22 @@ from flask import render_template
 from flask_login import login_required, current_user
 from . import users_bp
 
-from app.models import WordList, QuizResult
+from app.extensions import db
+from app.models import WordList, Word
+from app.services.analytics import get_profile_stats, get_quiz_series
+from app.services.rollups import get_user_stats
 
 @users_bp.route("/profile")
 @login_required
 def profile():
     user = current_user
-    wordlists = WordList.query.filter_by(user_id=user.id).all()
-
-    total_words = sum(len(wl.words) for wl in wordlists)
-    total_lists = len(wordlists)
-
-    quizzes = QuizResult.query.filter_by(user_id=user.id).order_by(QuizResult.date).all()
-
-    hardest = []
-    for wl in wordlists:
-        for w in wl.words:
-            hardest.append({
-                "original": w.original,
-                "wrong_count": getattr(w, "wrong_count", 0),
-                "correct_count": getattr(w, "correct_count", 0),
-                "last_wrong": w.last_wrong.strftime("%d %b") if getattr(w, "last_wrong", None) else "–",
-            })
-
-    hardest.sort(key=lambda x: x["wrong_count"], reverse=True)
+    profile_stats = get_profile_stats(user.id)
+    db.session.commit()
 
     return render_template(
         "profile.html",
         user=user,
-        total_words=total_words,
-        total_lists=total_lists,
-        total_quizzes=len(quizzes),
-        quiz_labels=[q.date.strftime("%d %b") for q in quizzes],
-        quiz_scores=[q.correct_count for q in quizzes],
-        hardest_words=hardest,
+        **profile_stats,
     )
 
 @users_bp.route("/stats")
@@ -44,14 +26,13 @@ def stats():
     user = current_user
 
     # Hämtar statistik
-    total_lists = WordList.query.filter_by(user_id=user.id).count()
-    total_words = Word.query.join(WordList).filter(WordList.user_id == user.id).count()
-    total_quizzes = QuizResult.query.filter_by(user_id=user.id).count()
+    stats = get_user_stats(user.id)
+    db.session.commit()
 
     # Resultat över tid (till grafen)
-    quiz_results = QuizResult.query.filter_by(user_id=user.id).order_by(QuizResult.date).all()
-    quiz_labels = [q.date.strftime("%Y-%m-%d") for q in quiz_results]
-    quiz_scores = [q.correct_count for q in quiz_results]
+    series = get_quiz_series(user.id)
+    quiz_labels = [p["date"].strftime("%Y-%m-%d") for p in series]
+    quiz_scores = [p["score"] for p in series]
 
     # Svåraste ord (fel-sorterad topplista)
     hardest_words = (
@@ -67,9 +48,9 @@ def stats():
     return render_template(
         "users/stats.html",
         user=user,
-        total_lists=total_lists,
-        total_words=total_words,
-        total_quizzes=total_quizzes,
+        total_lists=stats.list_count,
+        total_words=stats.word_count,
+        total_quizzes=stats.quiz_count,
         quiz_labels=quiz_labels,
         quiz_scores=quiz_scores,
         hardest_words=hardest_words
@@ -0,0 +1,157 @@
+"""
+Mäter get_word_statistics/get_hardest_words mot den gamla Python-versionen.
+
+Bygger en SQLite-databas med --rows svarsloggar (standard 1 000 000) för en
+användare, kör båda varianterna och kontrollerar att de ger samma resultat.
+
+    python benchmarks/word_statistics.py [--rows N] [--words N] [--skip-baseline]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="antal svarsloggar")
+    parser.add_argument("--words", type=int, default=5_000, help="antal ord i användarens lista")
+    parser.add_argument("--skip-baseline", action="store_true", help="kör bara SQL-versionen")
+    return parser.parse_args()
+
+
+# ------------------------------------------------------
+# GAMLA VERSIONEN (före SQL-aggregeringen), för jämförelse
+# ------------------------------------------------------
+
+def baseline_word_statistics(user_id):
+    from app.models import QuizAnswerLog
+
+    stats = {}
+    for log in QuizAnswerLog.query.filter_by(user_id=user_id).all():
+        s = stats.setdefault(log.word_id, {"word_id": log.word_id, "correct": 0, "wrong": 0, "last_wrong": None})
+        if log.is_correct:
+            s["correct"] += 1
+        else:
+            s["wrong"] += 1
+            s["last_wrong"] = log.timestamp
+    return stats
+
+
+def baseline_hardest_words(user_id, limit=20):
+    from app.extensions import db
+    from app.models import Word
+
+    result = []
+    for word_id, s in baseline_word_statistics(user_id).items():
+        word = db.session.get(Word, word_id)
+        if word:
+            result.append({"original": word.original, "wrong": s["wrong"]})
+    result.sort(key=lambda x: x["wrong"], reverse=True)
+    return result[:limit]
+
+
+# ------------------------------------------------------
+# DATA
+# ------------------------------------------------------
+
+def seed(rows, words):
+    from app.extensions import db
+    from app.models import QuizResult, User, WordList
+
+    user = User(username="bench", email="bench@example.com", password="-")
+    db.session.add(user)
+    db.session.flush()
+    wl = WordList(name="bench", user_id=user.id, word_count=words)
+    db.session.add(wl)
+    db.session.flush()
+    quiz = QuizResult(user_id=user.id, correct_count=0, total_questions=0)
+    db.session.add(quiz)
+    db.session.commit()
+
+    conn = db.session.connection()
+    conn.exec_driver_sql(
+        "INSERT INTO word (original, translation, list_id, correct_count, wrong_count) VALUES (?, ?, ?, 0, 0)",
+        [(f"ord{i}", f"word{i}", wl.id) for i in range(words)],
+    )
+    first_word = conn.exec_driver_sql("SELECT min(id) FROM word").scalar()
+
+    # Stigande tidsstämplar, så att "senaste fel" är entydigt i båda versionerna
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    chunk = 100_000
+    for offset in range(0, rows, chunk):
+        conn.exec_driver_sql(
+            "INSERT INTO quiz_answer_log (user_id, quiz_result_id, word_id, user_answer, is_correct, timestamp) "
+            "VALUES (?, ?, ?, '', ?, ?)",
+            [
+                (
+                    user.id,
+                    quiz.id,
+                    first_word + rng.randrange(words),
+                    rng.random() < 0.7,
+                    (start + timedelta(seconds=n)).isoformat(sep=" "),
+                )
+                for n in range(offset, min(offset + chunk, rows))
+            ],
+        )
+    conn.exec_driver_sql("ANALYZE")
+    db.session.commit()
+    return user.id
+
+
+def timed(label, fn):
+    from app.extensions import db
+
+    db.session.expunge_all()
+    t0 = time.perf_counter()
+    result = fn()
+    print(f"{label:<34} {time.perf_counter() - t0:8.2f} s")
+    return result
+
+
+def main():
+    args = parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+    from app import create_app
+    from app.services.analytics import get_hardest_words, get_word_statistics
+
+    app = create_app()
+    with app.app_context():
+        t0 = time.perf_counter()
+        user_id = seed(args.rows, args.words)
+        print(f"{args.rows:,} svarsloggar, {args.words:,} ord (SQLite, fyllt på {time.perf_counter() - t0:.1f} s)\n")
+
+        stats = timed("get_word_statistics (SQL)", lambda: get_word_statistics(user_id))
+        hardest = timed("get_hardest_words (SQL)", lambda: get_hardest_words(user_id))
+
+        if args.skip_baseline:
+            return
+
+        old_stats = timed("get_word_statistics (Python)", lambda: baseline_word_statistics(user_id))
+        old_hardest = timed("get_hardest_words (Python)", lambda: baseline_hardest_words(user_id))
+
+        # Samma räknare per ord; senaste fel jämförs som tidpunkt (SQLite kan ge text)
+        def normalized(s):
+            return {
+                word_id: (v["correct"], v["wrong"], str(v["last_wrong"])[:19] if v["last_wrong"] else None)
+                for word_id, v in s.items()
+            }
+
+        assert normalized(stats) == normalized(old_stats), "get_word_statistics skiljer sig"
+        # Lika många fel kan sorteras olika; själva felantalen ska vara desamma
+        assert [h["wrong"] for h in hardest] == [h["wrong"] for h in old_hardest], "get_hardest_words skiljer sig"
+        print("\nResultaten stämmer överens.")
+
+
+if __name__ == "__main__":
+    main()
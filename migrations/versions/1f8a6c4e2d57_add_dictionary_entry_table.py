@@ -0,0 +1,45 @@
+"""Add dictionary_entry table
+
+Revision ID: 1f8a6c4e2d57
+Revises: 9d0e7c3b5f18
+Create Date: 2026-10-18 17:52:19.660841
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f8a6c4e2d57'
+down_revision = '9d0e7c3b5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('dictionary_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('original', sa.String(length=255), nullable=False),
+    sa.Column('translation', sa.String(length=255), nullable=False),
+    sa.Column('norm_original', sa.String(length=255), nullable=False),
+    sa.Column('norm_translation', sa.String(length=255), nullable=False),
+    sa.Column('usage_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('norm_original', 'norm_translation', name='uq_dictionary_entry_norm')
+    )
+
+    # Befintliga godkända ord; kan också köras om med `flask rebuild-dictionary`
+    op.execute(
+        """
+        INSERT INTO dictionary_entry (original, translation, norm_original, norm_translation, usage_count, updated_at)
+        SELECT min(original), min(translation), lower(original), lower(translation), count(*), CURRENT_TIMESTAMP
+        FROM word
+        WHERE is_global = true
+        GROUP BY lower(original), lower(translation)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('dictionary_entry')
@@ -0,0 +1,28 @@
+"""Add client_key to quiz_result
+
+Revision ID: 2eb885c73570
+Revises: e5f6b554fb40
+Create Date: 2026-10-18 10:47:05.902214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2eb885c73570'
+down_revision = 'e5f6b554fb40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quiz_result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_key', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_quiz_result_user_client_key', ['user_id', 'client_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_result', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_quiz_result_user_client_key', type_='unique')
+        batch_op.drop_column('client_key')
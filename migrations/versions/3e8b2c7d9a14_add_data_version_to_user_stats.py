@@ -0,0 +1,26 @@
+"""Add data_version to user_stats
+
+Revision ID: 3e8b2c7d9a14
+Revises: f0a6d93be215
+Create Date: 2026-10-18 14:12:36.905113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8b2c7d9a14'
+down_revision = 'f0a6d93be215'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_stats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('user_stats', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,47 @@
+"""Cascade deletes from word_list to word, list_share and quiz_answer_log
+
+Revision ID: 4b6d2e9f0a31
+Revises: e71b5a0c2d94
+Create Date: 2026-10-18 16:58:04.771352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b6d2e9f0a31'
+down_revision = 'e71b5a0c2d94'
+branch_labels = None
+depends_on = None
+
+
+# (tabell, kolumn, refererad tabell); namnen följer Postgres standard <tabell>_<kolumn>_fkey
+FOREIGN_KEYS = [
+    ('word', 'list_id', 'word_list'),
+    ('list_share', 'list_id', 'word_list'),
+    ('quiz_answer_log', 'word_id', 'word'),
+]
+
+
+def _recreate(ondelete):
+    for table, column, referent in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    # SQLite skapas med db.create_all() och upprätthåller inte FK:er som standard;
+    # där tar app/services/deletion.py bort raderna explicit
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _recreate('CASCADE')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _recreate(None)
@@ -0,0 +1,26 @@
+"""Add (user_id, date) index to quiz_result
+
+Revision ID: 5c0e4b8f2a97
+Revises: 3e8b2c7d9a14
+Create Date: 2026-10-18 14:55:48.120674
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e4b8f2a97'
+down_revision = '3e8b2c7d9a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quiz_result', schema=None) as batch_op:
+        batch_op.create_index('ix_quiz_result_user_date', ['user_id', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_result', schema=None) as batch_op:
+        batch_op.drop_index('ix_quiz_result_user_date')
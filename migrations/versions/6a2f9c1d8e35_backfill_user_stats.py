@@ -0,0 +1,80 @@
+"""Backfill user_stats for users without a row
+
+Revision ID: 6a2f9c1d8e35
+Revises: 1f8a6c4e2d57
+Create Date: 2026-10-18 19:05:37.214806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2f9c1d8e35'
+down_revision = '1f8a6c4e2d57'
+branch_labels = None
+depends_on = None
+
+
+# Samma regler som rebuild_user_stats: räknare från källtabellerna, streaks
+# som sammanhängande dagar med svar (luckor-och-öar: dag minus radnummer är
+# konstant inom en svit). Bara användare som saknar rad berörs.
+BACKFILL = """
+INSERT INTO user_stats (
+    user_id, word_count, list_count, quiz_count, total_correct, total_wrong,
+    current_streak, best_streak, last_active_day, data_version
+)
+WITH days AS (
+    SELECT DISTINCT user_id, date(timestamp) AS day
+    FROM quiz_answer_log
+    WHERE timestamp IS NOT NULL
+),
+islands AS (
+    SELECT user_id, day, {island} AS grp
+    FROM days
+),
+runs AS (
+    SELECT user_id, count(*) AS length, max(day) AS last_day
+    FROM islands
+    GROUP BY user_id, grp
+),
+streaks AS (
+    SELECT r.user_id, max(r.length) AS best, max(r.last_day) AS last_day,
+           max(CASE WHEN r.last_day = l.last_day THEN r.length END) AS current
+    FROM runs r
+    JOIN (SELECT user_id, max(last_day) AS last_day FROM runs GROUP BY user_id) l
+      ON l.user_id = r.user_id
+    GROUP BY r.user_id
+)
+SELECT
+    u.id,
+    (SELECT count(*) FROM word w JOIN word_list wl ON w.list_id = wl.id WHERE wl.user_id = u.id),
+    (SELECT count(*) FROM word_list wl WHERE wl.user_id = u.id),
+    (SELECT count(*) FROM quiz_result q WHERE q.user_id = u.id),
+    (SELECT count(*) FROM quiz_answer_log a WHERE a.user_id = u.id AND a.is_correct = {true}),
+    (SELECT count(*) FROM quiz_answer_log a WHERE a.user_id = u.id AND (a.is_correct IS NULL OR a.is_correct <> {true})),
+    coalesce(s.current, 0),
+    coalesce(s.best, 0),
+    s.last_day,
+    0
+FROM users u
+LEFT JOIN streaks s ON s.user_id = u.id
+WHERE NOT EXISTS (SELECT 1 FROM user_stats us WHERE us.user_id = u.id)
+"""
+
+
+def upgrade():
+    # Adminlistan och exporten läser räknarna direkt från user_stats
+    if op.get_bind().dialect.name == 'postgresql':
+        island = "day - CAST(row_number() OVER (PARTITION BY user_id ORDER BY day) AS integer)"
+        true = "true"
+    else:
+        island = "julianday(day) - row_number() OVER (PARTITION BY user_id ORDER BY day)"
+        true = "1"
+
+    op.execute(BACKFILL.format(island=island, true=true))
+
+
+def downgrade():
+    # Raderna är härledda och kan ligga kvar; de byggs annars om vid första läsningen
+    pass
@@ -0,0 +1,32 @@
+"""Add daily_answer_stats rollup table
+
+Revision ID: 7a3e5f21c9d8
+Revises: c4d1a9e07b3f
+Create Date: 2026-10-18 11:58:27.604193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e5f21c9d8'
+down_revision = 'c4d1a9e07b3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fyll på befintliga loggar med `flask backfill-daily-stats`
+    op.create_table('daily_answer_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('correct', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('wrong', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_answer_stats')
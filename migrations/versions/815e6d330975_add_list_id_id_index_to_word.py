@@ -0,0 +1,26 @@
+"""Add (list_id, id) index to word
+
+Revision ID: 815e6d330975
+Revises: 336e2b388cd3
+Create Date: 2026-10-18 09:12:40.118342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '815e6d330975'
+down_revision = '336e2b388cd3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.create_index('ix_word_list_id_id', ['list_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_list_id_id')
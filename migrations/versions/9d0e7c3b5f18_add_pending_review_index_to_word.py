@@ -0,0 +1,34 @@
+"""Add partial index on unapproved words for the review queue
+
+Revision ID: 9d0e7c3b5f18
+Revises: 4b6d2e9f0a31
+Create Date: 2026-10-18 17:24:45.118306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d0e7c3b5f18'
+down_revision = '4b6d2e9f0a31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kön filtrerar på is_global = false; äldre rader med NULL skulle annars falla utanför
+    word = sa.table('word', sa.column('is_global', sa.Boolean()))
+    op.execute(word.update().where(word.c.is_global.is_(None)).values(is_global=False))
+
+    op.create_index(
+        'ix_word_pending_norm', 'word',
+        [sa.text('lower(original)'), sa.text('lower(translation)')],
+        unique=False,
+        postgresql_where=sa.text('is_global = false'),
+        sqlite_where=sa.text('is_global = 0'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_word_pending_norm', table_name='word')
@@ -0,0 +1,36 @@
+"""Add sort indexes for list and word listings
+
+Revision ID: a84c1f7e6b23
+Revises: 5c0e4b8f2a97
+Create Date: 2026-10-18 15:42:10.318527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a84c1f7e6b23'
+down_revision = '5c0e4b8f2a97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.create_index('ix_word_list_id_original', ['list_id', 'original'], unique=False)
+        batch_op.create_index('ix_word_list_id_last_wrong', ['list_id', 'last_wrong'], unique=False)
+
+    with op.batch_alter_table('word_list', schema=None) as batch_op:
+        batch_op.create_index('ix_word_list_user_name', ['user_id', 'name'], unique=False)
+        batch_op.create_index('ix_word_list_user_word_count', ['user_id', 'word_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('word_list', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_list_user_word_count')
+        batch_op.drop_index('ix_word_list_user_name')
+
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_list_id_last_wrong')
+        batch_op.drop_index('ix_word_list_id_original')
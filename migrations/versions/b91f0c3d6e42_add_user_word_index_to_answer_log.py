@@ -0,0 +1,26 @@
+"""Add (user_id, word_id) index to quiz_answer_log
+
+Revision ID: b91f0c3d6e42
+Revises: 7a3e5f21c9d8
+Create Date: 2026-10-18 12:31:44.871520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91f0c3d6e42'
+down_revision = '7a3e5f21c9d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quiz_answer_log', schema=None) as batch_op:
+        batch_op.create_index('ix_quiz_answer_log_user_word', ['user_id', 'word_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_answer_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_quiz_answer_log_user_word')
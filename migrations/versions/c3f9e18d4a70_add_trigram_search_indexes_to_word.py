@@ -0,0 +1,55 @@
+"""Add trigram search indexes to word (Postgres only)
+
+Revision ID: c3f9e18d4a70
+Revises: a84c1f7e6b23
+Create Date: 2026-10-18 16:08:37.504219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9e18d4a70'
+down_revision = 'a84c1f7e6b23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lokalt (SQLite) används en FTS5-tabell som skapas i create_app
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+
+    # unaccent() är bara STABLE och kan därför inte indexeras direkt
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    op.create_index(
+        'ix_word_original_trgm', 'word',
+        [sa.text('lower(immutable_unaccent(original)) gin_trgm_ops')],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_word_translation_trgm', 'word',
+        [sa.text('lower(immutable_unaccent(translation)) gin_trgm_ops')],
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_word_translation_trgm', table_name='word')
+    op.drop_index('ix_word_original_trgm', table_name='word')
+    op.execute('DROP FUNCTION IF EXISTS immutable_unaccent(text)')
@@ -0,0 +1,37 @@
+"""Add user_stats rollup table
+
+Revision ID: c4d1a9e07b3f
+Revises: 2eb885c73570
+Create Date: 2026-10-18 11:20:51.337460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d1a9e07b3f'
+down_revision = '2eb885c73570'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Raderna byggs vid första läsningen eller med `flask rebuild-user-stats`
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('list_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('quiz_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('total_correct', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('total_wrong', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('best_streak', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('last_active_day', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_stats')
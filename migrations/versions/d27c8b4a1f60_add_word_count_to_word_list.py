@@ -0,0 +1,31 @@
+"""Add word_count to word_list
+
+Revision ID: d27c8b4a1f60
+Revises: b91f0c3d6e42
+Create Date: 2026-10-18 13:05:19.224806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd27c8b4a1f60'
+down_revision = 'b91f0c3d6e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word_list', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute(
+        "UPDATE word_list SET word_count = "
+        "(SELECT COUNT(*) FROM word WHERE word.list_id = word_list.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('word_list', schema=None) as batch_op:
+        batch_op.drop_column('word_count')
@@ -0,0 +1,40 @@
+"""Add SM-2 schedule columns to word
+
+Revision ID: e5f6b554fb40
+Revises: 815e6d330975
+Create Date: 2026-10-18 10:02:13.540871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6b554fb40'
+down_revision = '815e6d330975'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_due', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('interval_days', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('ease', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('repetitions', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_word_list_id_next_due', ['list_id', 'next_due'], unique=False)
+
+    # Befintliga ord är förfallna direkt
+    op.execute(
+        "UPDATE word SET next_due = CURRENT_TIMESTAMP, interval_days = 0, "
+        "ease = 2.5, repetitions = 0 WHERE next_due IS NULL"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_list_id_next_due')
+        batch_op.drop_column('repetitions')
+        batch_op.drop_column('ease')
+        batch_op.drop_column('interval_days')
+        batch_op.drop_column('next_due')
@@ -0,0 +1,38 @@
+"""Add list_share table
+
+Revision ID: e71b5a0c2d94
+Revises: c3f9e18d4a70
+Create Date: 2026-10-18 16:31:52.940118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e71b5a0c2d94'
+down_revision = 'c3f9e18d4a70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('list_share',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('list_id', sa.Integer(), nullable=False),
+    sa.Column('recipient_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['list_id'], ['word_list.id'], ),
+    sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('list_id', 'recipient_id', name='uq_list_share_list_recipient')
+    )
+    with op.batch_alter_table('list_share', schema=None) as batch_op:
+        batch_op.create_index('ix_list_share_recipient', ['recipient_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('list_share', schema=None) as batch_op:
+        batch_op.drop_index('ix_list_share_recipient')
+
+    op.drop_table('list_share')
@@ -0,0 +1,26 @@
+"""Add (list_id, wrong_count) index to word
+
+Revision ID: f0a6d93be215
+Revises: d27c8b4a1f60
+Create Date: 2026-10-18 13:40:02.419377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f0a6d93be215'
+down_revision = 'd27c8b4a1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.create_index('ix_word_list_id_wrong_count', ['list_id', 'wrong_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('word', schema=None) as batch_op:
+        batch_op.drop_index('ix_word_list_id_wrong_count')
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Word, WordList
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Egen SQLite-fil per test (create_all + FTS körs av create_app)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("SECRET_KEY", "test")
+
+    app = create_app()
+
+    # Processcacherna nycklas på id:n, som börjar om i varje ny databas
+    from app.services.answers import _answer_indexes
+    from app.services.dictionary import invalidate_dictionary
+    from app.services.sampling import _samplers
+    _answer_indexes.clear()
+    _samplers.clear()
+    invalidate_dictionary()
+
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def make_user(app):
+    def make(username="anna", words=()):
+        user = User(username=username, email=f"{username}@example.com")
+        user.set_password("hemligt")
+        db.session.add(user)
+        db.session.flush()
+
+        wl = WordList(name=f"{username}s lista", user_id=user.id, word_count=len(words))
+        db.session.add(wl)
+        db.session.flush()
+
+        for original, translation in words:
+            db.session.add(Word(original=original, translation=translation, list_id=wl.id))
+
+        db.session.commit()
+        return user, wl
+
+    return make
+
+
+@pytest.fixture
+def login(app):
+    def login(client, user):
+        # Tar även ett id, för trådar som inte delar testets session
+        user_id = getattr(user, "id", user)
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+            sess["_fresh"] = True
+    return login
+
+
+@pytest.fixture
+def statements(app):
+    """Loggar (sql, executemany) för varje anrop till databasdrivrutinen."""
+    log = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.append((statement, executemany))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield log
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import pg8000
+
+from app.extensions import db
+from app.models import QuizResult
+from app.services.analytics import _bucket_expr, get_quiz_series
+
+
+def test_postgres_bucket_has_no_bound_unit():
+    period = _bucket_expr("week", "postgresql").label("period")
+    stmt = select(period, func.count(QuizResult.id)).group_by(period)
+
+    sql = str(stmt.compile(dialect=pg8000.dialect()))
+
+    # Samma uttryck i SELECT och GROUP BY, utan parametrar som Postgres ser som olika
+    assert "%s" not in sql
+    assert sql.count("date_trunc('week', quiz_result.date)") == 2
+
+
+def test_quiz_series_buckets_by_week(make_user):
+    user, _ = make_user()
+    monday = datetime(2026, 1, 5, 12)
+    for day, score in [(0, 4), (2, 6), (7, 10)]:
+        db.session.add(QuizResult(
+            user_id=user.id, correct_count=score, total_questions=10, date=monday + timedelta(days=day)
+        ))
+    db.session.commit()
+
+    series = get_quiz_series(user.id, bucket="week")
+
+    assert [(p["date"], p["score"], p["quizzes"]) for p in series] == [
+        (datetime(2026, 1, 5), 5.0, 2),
+        (datetime(2026, 1, 12), 10.0, 1),
+    ]
@@ -0,0 +1,37 @@
+import json
+
+from app.extensions import db
+from app.models import Word
+from app.services.answers import get_user_answer_index
+from app.services.rollups import bump_user_stats
+
+
+def test_index_follows_writes_from_other_workers(make_user):
+    user, wl = make_user(words=[("hund", "dog")])
+    assert get_user_answer_index(user.id).translations("hund") == ["dog"]
+
+    # Samma sak som en annan worker gör: skriver och räknar upp versionen,
+    # men kan inte nå den här processens cache
+    word = Word.query.filter_by(list_id=wl.id).one()
+    word.translation = "hound"
+    bump_user_stats(user.id)
+    db.session.commit()
+
+    assert get_user_answer_index(user.id).translations("hund") == ["hound"]
+
+
+def test_quiz_finish_keeps_cached_index(app, make_user, login):
+    user, wl = make_user(words=[("hund", "dog")])
+    word = Word.query.filter_by(list_id=wl.id).one()
+    index = get_user_answer_index(user.id)
+
+    client = app.test_client()
+    login(client, user)
+    response = client.post("/quiz/finish", data={
+        "correct": 1,
+        "total": 1,
+        "answers": json.dumps([{"id": word.id, "correct": True, "user_answer": "dog"}]),
+    })
+
+    assert response.status_code == 200
+    assert get_user_answer_index(user.id) is index
@@ -0,0 +1,50 @@
+from app.extensions import db
+from app.models import Word, WordList
+from app.services.batch import apply_word_ops
+
+
+WORDS = [("hund", "dog"), ("katt", "cat"), ("häst", "horse"), ("ko", "cow")]
+
+
+def test_batch_api_rejects_non_integer_ids(app, make_user, login):
+    user, wl = make_user(words=WORDS)
+    client = app.test_client()
+    login(client, user)
+
+    response = client.post(f"/lists/api/{wl.id}/batch", json={"ops": [
+        {"op": "delete", "id": [1]},
+        {"op": "update", "id": {"x": 1}, "original": "a"},
+        {"op": "move", "id": True, "to_list": wl.id},
+        {"op": "move", "id": 1, "to_list": [wl.id]},
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["ok"] for r in results] == [False] * 4
+    assert Word.query.count() == len(WORDS)
+
+
+def test_moves_update_all_list_counts_in_one_statement(make_user, statements):
+    user, wl = make_user(words=WORDS)
+    targets = []
+    for name in ("a", "b"):
+        target = WordList(name=name, user_id=user.id, word_count=0)
+        db.session.add(target)
+        targets.append(target)
+    db.session.commit()
+
+    ids = [w.id for w in Word.query.filter_by(list_id=wl.id).order_by(Word.id)]
+    statements.clear()
+    apply_word_ops(wl, [
+        {"op": "move", "id": ids[0], "to_list": targets[0].id},
+        {"op": "move", "id": ids[1], "to_list": targets[1].id},
+        {"op": "move", "id": ids[2], "to_list": targets[1].id},
+        {"op": "delete", "id": ids[3]},
+    ])
+    db.session.commit()
+
+    list_updates = [sql for sql, _ in statements if sql.lstrip().upper().startswith("UPDATE WORD_LIST")]
+    assert len(list_updates) == 1
+
+    db.session.expire_all()
+    assert [db.session.get(WordList, i).word_count for i in (wl.id, targets[0].id, targets[1].id)] == [0, 1, 2]
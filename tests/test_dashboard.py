@@ -0,0 +1,42 @@
+from datetime import date, datetime
+
+from app.services.sampling import todays_word
+
+
+def test_dashboard_etag_follows_the_day(app, make_user, login):
+    user, _ = make_user()
+    client = app.test_client()
+    login(client, user)
+
+    first = client.get("/dashboard/")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert datetime.utcnow().date().isoformat() in etag
+
+    again = client.get("/dashboard/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    # En ETag från gårdagen (samma data_version) ska ge en ny sida
+    stale = etag.replace(datetime.utcnow().date().isoformat(), "2000-01-01")
+    assert client.get("/dashboard/", headers={"If-None-Match": stale}).status_code == 200
+
+
+def test_dashboard_shows_todays_word(app, make_user, login):
+    user, _ = make_user(words=[("hund", "dog"), ("katt", "cat"), ("häst", "horse")])
+    make_user("bertil", [("sol", "sun")])
+    client = app.test_client()
+    login(client, user)
+
+    today = datetime.utcnow().date()
+    word = todays_word(user.id, today)
+    assert word.original in {"hund", "katt", "häst"}
+    assert todays_word(user.id, today).id == word.id
+
+    page = client.get("/dashboard/").get_data(as_text=True)
+    assert f"<strong>{word.original}</strong>, {word.translation}" in page
+
+
+def test_todays_word_is_none_without_words(make_user):
+    user, _ = make_user()
+
+    assert todays_word(user.id, date(2026, 1, 1)) is None
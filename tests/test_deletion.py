@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import DailyAnswerStat, QuizAnswerLog, QuizResult, UserStats, Word
+from app.services.deletion import delete_list, delete_words
+from app.services.rollups import (
+    backfill_daily_stats,
+    bump_list_word_count,
+    bump_user_stats,
+    get_user_stats,
+    rebuild_user_stats,
+    record_daily_answers,
+    record_quiz_stats,
+)
+
+
+WORDS = [("hund", "dog"), ("katt", "cat"), ("häst", "horse")]
+
+
+def _answer(user, words, day, correct):
+    """Ett förhör via samma rollup-vägar som quiz_finish."""
+    result = QuizResult(user_id=user.id, correct_count=0, total_questions=len(words), date=day)
+    db.session.add(result)
+    db.session.flush()
+    for word, ok in zip(words, correct):
+        db.session.add(QuizAnswerLog(
+            user_id=user.id, quiz_result_id=result.id, word_id=word.id,
+            user_answer="x", is_correct=ok, timestamp=day,
+        ))
+    right = sum(correct)
+    record_quiz_stats(user.id, right, len(correct) - right, day=day.date())
+    record_daily_answers(user.id, right, len(correct) - right, day=day.date())
+    db.session.commit()
+
+
+def _snapshot(user_id):
+    db.session.expire_all()
+    stats = db.session.get(UserStats, user_id)
+    daily = db.session.execute(
+        select(DailyAnswerStat.day, DailyAnswerStat.correct, DailyAnswerStat.wrong)
+        .where(DailyAnswerStat.user_id == user_id)
+        .order_by(DailyAnswerStat.day)
+    ).all()
+    return (stats.word_count, stats.list_count, stats.total_correct, stats.total_wrong), daily
+
+
+def _rebuilt(user_id):
+    rebuild_user_stats(user_id)
+    backfill_daily_stats(user_id)
+    db.session.commit()
+    return _snapshot(user_id)
+
+
+def _setup(make_user):
+    user, wl = make_user(words=WORDS)
+    get_user_stats(user.id)
+    words = Word.query.filter_by(list_id=wl.id).order_by(Word.id).all()
+    _answer(user, words, datetime(2026, 3, 1, 9), [True, False, True])
+    _answer(user, words[:1], datetime(2026, 3, 2, 9), [False])
+    return user, wl, words
+
+
+def test_delete_words_keeps_counters_in_line_with_rebuild(make_user):
+    user, wl, words = _setup(make_user)
+
+    delete_words([words[0].id])
+    bump_list_word_count(wl.id, -1)
+    bump_user_stats(user.id, word_count=-1)
+    db.session.commit()
+
+    incremental = _snapshot(user.id)
+    assert incremental[0][2:] == (1, 1)
+    # Dagen med bara det borttagna ordet försvinner helt
+    assert [d.day.isoformat() for d in incremental[1]] == ["2026-03-01"]
+    assert incremental == _rebuilt(user.id)
+
+
+def test_delete_list_keeps_counters_in_line_with_rebuild(make_user):
+    user, wl, _ = _setup(make_user)
+
+    delete_list(wl.id)
+    bump_user_stats(user.id, list_count=-1, word_count=-len(WORDS))
+    db.session.commit()
+
+    incremental = _snapshot(user.id)
+    assert incremental == ((0, 0, 0, 0), [])
+    assert incremental == _rebuilt(user.id)
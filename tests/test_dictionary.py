@@ -0,0 +1,79 @@
+from app.extensions import db
+from app.models import DictionaryEntry, Word
+from app.services.batch import apply_word_ops
+from app.services.deletion import delete_list, delete_words
+from app.services.dictionary import PrefixIndex, TOP_K, get_dictionary_index, sync_dictionary
+
+
+ADMIN_EMAIL = "rikard.nygander@gmail.com"
+
+
+def _approve(list_id):
+    Word.query.filter_by(list_id=list_id).update({"is_global": True})
+    sync_dictionary()
+    db.session.commit()
+
+
+def _usage():
+    return {(e.norm_original, e.norm_translation): e.usage_count for e in DictionaryEntry.query}
+
+
+def test_suggest_ranks_whole_prefix_range_before_limiting():
+    # Det vanligaste ordet ligger sist i bokstavsordning bland många kandidater
+    entries = [(f"sa{i:04d}", f"x{i}", 1) for i in range(500)] + [("sax", "scissors", 50)]
+    index = PrefixIndex(entries)
+
+    for prefix in ("s", "sa", "sa0"):
+        expected = "sax" if prefix != "sa0" else "sa0000"
+        assert index.suggest(prefix, limit=3)[0]["original"] == expected
+
+    assert len(index.suggest("s", limit=TOP_K)) == TOP_K
+
+
+def test_suggest_puts_exact_match_first():
+    index = PrefixIndex([("hus", "house", 1), ("husvagn", "caravan", 9), ("Hus", "home", 3)])
+
+    assert [s["translation"] for s in index.suggest("hus")] == ["home", "house", "caravan"]
+
+
+def test_index_is_refreshed_after_approval(app, make_user, login):
+    admin, _ = make_user("rikard")
+    admin.email = ADMIN_EMAIL
+    _, wl = make_user("anna", [("hund", "dog")])
+    word = Word.query.filter_by(list_id=wl.id).one()
+    db.session.commit()
+
+    assert get_dictionary_index().suggest("hu") == []
+
+    client = app.test_client()
+    login(client, admin)
+    client.get(f"/admin/approve/{word.id}")
+
+    assert get_dictionary_index().suggest("hu") == [{"original": "hund", "translation": "dog"}]
+
+
+def test_deleting_global_words_counts_down_and_removes_entries(make_user):
+    _, anna = make_user("anna", [("hund", "dog"), ("katt", "cat")])
+    _, bertil = make_user("bertil", [("Hund", "Dog")])
+    _approve(anna.id)
+    _approve(bertil.id)
+    assert _usage() == {("hund", "dog"): 2, ("katt", "cat"): 1}
+
+    delete_list(bertil.id)
+    db.session.commit()
+    assert _usage() == {("hund", "dog"): 1, ("katt", "cat"): 1}
+
+    delete_words([w.id for w in Word.query.filter_by(list_id=anna.id)])
+    db.session.commit()
+    assert _usage() == {}
+
+
+def test_editing_global_word_moves_its_entry(make_user):
+    _, wl = make_user("anna", [("hnud", "dog")])
+    _approve(wl.id)
+    word = Word.query.filter_by(list_id=wl.id).one()
+
+    apply_word_ops(wl, [{"op": "update", "id": word.id, "original": "hund"}])
+    db.session.commit()
+
+    assert _usage() == {("hund", "dog"): 1}
@@ -0,0 +1,83 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from app.extensions import db
+from app.models import Word
+from app.services import exporter
+from app.services.exporter import export_chunks
+
+
+COLUMNS = ["original", "translation", "when"]
+ROWS = [("hund", "dog", datetime(2026, 1, 2, 3, 4)), ("katt", None, None), ("häst", "horse", None)]
+
+
+def _export(fmt, rows=ROWS, **kwargs):
+    return b"".join(export_chunks(COLUMNS, iter(rows), fmt, **kwargs))
+
+
+def test_csv_export_has_bom_header_and_rows():
+    text = _export("csv").decode("utf-8")
+
+    assert text.startswith("\ufeff")
+    assert list(csv.reader(io.StringIO(text[1:]))) == [
+        COLUMNS,
+        ["hund", "dog", "2026-01-02T03:04:00"],
+        ["katt", "", ""],
+        ["häst", "horse", ""],
+    ]
+
+
+def test_jsonl_export_is_one_object_per_row():
+    lines = _export("jsonl").decode("utf-8").splitlines()
+
+    assert [json.loads(line) for line in lines][:2] == [
+        {"original": "hund", "translation": "dog", "when": "2026-01-02T03:04:00"},
+        {"original": "katt", "translation": None, "when": None},
+    ]
+
+
+def test_gzip_export_decompresses_to_plain_export():
+    assert gzip.decompress(_export("jsonl", gzip=True)) == _export("jsonl")
+
+
+def test_xlsx_export_splits_rows_over_sheets(monkeypatch):
+    # Rubrik + två rader per blad
+    monkeypatch.setattr(exporter, "XLSX_MAX_ROWS", 3)
+
+    workbook = load_workbook(io.BytesIO(_export("xlsx")))
+
+    assert workbook.sheetnames == ["Export 1", "Export 2"]
+    sheets = [list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets]
+    assert [row[0] for row in sheets[0]] == ["original", "hund", "katt"]
+    assert [row[0] for row in sheets[1]] == ["original", "häst"]
+
+
+def test_empty_xlsx_export_keeps_header():
+    workbook = load_workbook(io.BytesIO(_export("xlsx", rows=[])))
+
+    assert [list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets] == [[tuple(COLUMNS)]]
+
+
+def test_list_export_route_streams_only_own_words(app, make_user, login):
+    user, wl = make_user("anna", [("hund", "dog")])
+    make_user("bertil", [("katt", "cat")])
+    db.session.get(Word, 1).wrong_count = 2
+    db.session.commit()
+    client = app.test_client()
+    login(client, user)
+
+    response = client.get("/lists/export?format=csv")
+
+    assert response.headers["Content-Disposition"] == 'attachment; filename="ordlistor.csv"'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip("\ufeff"))))
+    assert rows == [exporter.WORD_COLUMNS, [wl.name, "hund", "dog", "0", "2", ""]]
+
+    response = client.get(f"/lists/{wl.id}/export?format=xlsx&gzip=1")
+    assert response.headers["Content-Disposition"] == f'attachment; filename="ordlista-{wl.id}.xlsx.gz"'
+    workbook = load_workbook(io.BytesIO(gzip.decompress(response.get_data())))
+    assert list(workbook.active.iter_rows(values_only=True))[1][1:3] == ("hund", "dog")
@@ -0,0 +1,83 @@
+import io
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from app.extensions import db
+from app.models import Word
+from app.services.importer import ImportFileError, import_words, iter_word_rows
+
+
+def _xlsx(rows):
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    out.seek(0)
+    return out
+
+
+def test_import_words_inserts_one_statement_per_batch(make_user, statements):
+    user, wl = make_user(words=[("hund", "dog")])
+    rows = [("hund", "dog")] + [(f"ord{i}", f"word{i}") for i in range(5)]
+    statements.clear()
+
+    added, skipped = import_words(wl, iter(rows), batch_size=2)
+    db.session.commit()
+
+    inserts = [sql for sql, _ in statements if sql.lstrip().upper().startswith("INSERT")]
+    assert (added, skipped) == (5, 1)
+    # insertmanyvalues: en flerradig INSERT per batch, inte en per rad
+    assert len(inserts) == 3
+    assert [sql.count("(?, ?, ?") for sql in inserts] == [2, 2, 1]
+    assert Word.query.filter_by(list_id=wl.id).count() == 6
+
+
+def test_iter_word_rows_reads_csv_and_skips_header():
+    data = io.BytesIO("original;translation\nhund;dog\n\nkatt;cat\n".encode())
+    assert list(iter_word_rows(data, "ord.csv")) == [("hund", "dog"), ("katt", "cat")]
+
+
+def test_malformed_csv_raises_import_error():
+    data = io.BytesIO(("hund," + "x" * 200_000 + "\n").encode())
+    with pytest.raises(ImportFileError):
+        list(iter_word_rows(data, "ord.csv"))
+
+
+def test_non_utf8_csv_raises_import_error():
+    data = io.BytesIO("häst,horse\n".encode("latin-1"))
+    with pytest.raises(ImportFileError):
+        list(iter_word_rows(data, "ord.csv"))
+
+
+def test_corrupt_xlsx_sheet_raises_import_error():
+    # Giltig arbetsbok där själva arket är trasig XML
+    src = zipfile.ZipFile(_xlsx([("hund", "dog")]))
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data[: len(data) // 2]
+            dst.writestr(item, data)
+    out.seek(0)
+
+    with pytest.raises(ImportFileError):
+        list(iter_word_rows(out, "ord.xlsx"))
+
+
+def test_import_route_reports_bad_file_instead_of_500(app, make_user, login):
+    user, wl = make_user(words=[])
+    client = app.test_client()
+    login(client, user)
+
+    response = client.post(
+        f"/lists/{wl.id}/import",
+        data={"file": (io.BytesIO(("hund," + "x" * 200_000 + "\n").encode()), "ord.csv")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 302
+    assert Word.query.filter_by(list_id=wl.id).count() == 0
@@ -0,0 +1,68 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Word
+from app.services.listing import InvalidCursor, decode_cursor, encode_cursor, word_page
+
+
+def _token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_recent_wrong_pages_across_null_boundary(make_user):
+    _, wl = make_user(words=[(f"ord{i}", f"word{i}") for i in range(7)])
+    start = datetime(2026, 1, 1)
+    words = Word.query.filter_by(list_id=wl.id).order_by(Word.id).all()
+    # Tre med senaste fel (två med samma tid), fyra som aldrig varit fel
+    for word, last_wrong in zip(words, [start, start + timedelta(days=1), start + timedelta(days=1)]):
+        word.last_wrong = last_wrong
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = word_page(wl.id, "recent_wrong", after=cursor, limit=2)
+        seen += [r.id for r in rows]
+        if cursor is None:
+            break
+
+    ids = [w.id for w in words]
+    assert seen == [ids[2], ids[1], ids[0], ids[6], ids[5], ids[4], ids[3]]
+
+
+def test_cursor_round_trips_dates():
+    value = datetime(2026, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor(value, 7)) == (value, 7)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("token", [
+    "inte-base64!",
+    _token({"a": 1}),
+    _token([[1, 2], 3]),
+    _token([{"x": {"y": 1}}, 3]),
+    _token(["a", "3"]),
+    _token(["a", True]),
+    _token([True, 3]),
+    _token([{"dt": "igår"}, 3]),
+])
+def test_decode_cursor_rejects_malformed_tokens(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize("sort, value", [("recent_wrong", "hund"), ("hardest", 1.5), ("alpha", 3)])
+def test_bad_cursor_gives_400(app, make_user, login, sort, value):
+    user, wl = make_user(words=[("hund", "dog")])
+    client = app.test_client()
+    login(client, user)
+
+    response = client.get(f"/lists/api/{wl.id}/words?sort={sort}&after={_token([value, 1])}")
+    assert response.status_code == 400
+
+    response = client.get(f"/lists/api/{wl.id}/words?after={_token([['x'], 1])}")
+    assert response.status_code == 400
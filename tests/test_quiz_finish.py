@@ -0,0 +1,113 @@
+import json
+import threading
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+
+from app.extensions import db
+from app.models import DailyAnswerStat, QuizAnswerLog, QuizResult, UserStats, Word
+from app.services.rollups import get_user_stats
+
+
+WORDS = [("hund", "dog"), ("katt", "cat"), ("häst", "horse")]
+
+
+def test_parallel_finishes_with_repeated_keys_keep_counts_consistent(app, make_user, login):
+    user, wl = make_user(words=WORDS)
+    get_user_stats(user.id)
+    db.session.commit()
+    words = Word.query.filter_by(list_id=wl.id).order_by(Word.id).all()
+    first, rest = words[0].id, [w.id for w in words[1:]]
+
+    # Rätt på första ordet, fel på de andra, i varje förhör
+    answers = json.dumps(
+        [{"id": first, "correct": True, "user_answer": "dog"}]
+        + [{"id": i, "correct": False, "user_answer": "?"} for i in rest]
+    )
+
+    # Fyra nycklar som skickas två gånger var (samtidigt), plus två utan nyckel
+    keys = [f"quiz-{n}" for n in range(4)] * 2 + [None, None]
+    user_id = user.id
+    barrier = threading.Barrier(len(keys))
+    statuses, errors = [], []
+
+    def finish(key):
+        form = {"correct": 1, "total": 3, "answers": answers}
+        if key:
+            form["quiz_key"] = key
+        try:
+            client = app.test_client()
+            login(client, user_id)
+            barrier.wait()
+            response = client.post("/quiz/finish", data=form)
+            statuses.append((response.status_code, response.get_json()["status"]))
+        except Exception as exc:  # noqa: BLE001 - rapporteras i huvudtråden
+            errors.append(exc)
+
+    threads = [threading.Thread(target=finish, args=(key,)) for key in keys]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert Counter(statuses) == {(200, "ok"): 6, (200, "duplicate"): 4}
+
+    db.session.expire_all()
+    quizzes = 6
+
+    assert db.session.scalar(select(func.count()).select_from(QuizResult)) == quizzes
+    assert db.session.scalar(select(func.count()).select_from(QuizAnswerLog)) == quizzes * 3
+    assert sorted(
+        db.session.scalars(select(QuizResult.client_key).where(QuizResult.client_key.is_not(None)))
+    ) == [f"quiz-{n}" for n in range(4)]
+
+    counts = {w.id: (w.correct_count, w.wrong_count) for w in Word.query.all()}
+    assert counts[first] == (quizzes, 0)
+    assert all(counts[i] == (0, quizzes) for i in rest)
+
+    stats = db.session.get(UserStats, user_id)
+    assert (stats.quiz_count, stats.total_correct, stats.total_wrong) == (quizzes, quizzes, 2 * quizzes)
+    assert stats.last_active_day == datetime.utcnow().date()
+
+    daily = DailyAnswerStat.query.filter_by(user_id=user_id).all()
+    assert [(d.correct, d.wrong) for d in daily] == [(quizzes, 2 * quizzes)]
+
+
+def test_finish_lists_hardest_words_from_word_counters(app, make_user, login, statements):
+    user, wl = make_user(words=WORDS)
+    get_user_stats(user.id)
+    db.session.commit()
+    words = Word.query.filter_by(list_id=wl.id).order_by(Word.id).all()
+
+    client = app.test_client()
+    login(client, user)
+    answers = json.dumps(
+        [{"id": words[0].id, "correct": True, "user_answer": "dog"}]
+        + [{"id": w.id, "correct": False, "user_answer": "?"} for w in words[1:]]
+    )
+    statements.clear()
+    response = client.post("/quiz/finish", data={"correct": 1, "total": 3, "answers": answers})
+
+    hardest = response.get_json()["hardest_words"]
+    assert [(h["original"], h["correct"], h["wrong"]) for h in hardest] == [("katt", 0, 1), ("häst", 0, 1)]
+    assert all(h["last_wrong"] != "–" for h in hardest)
+
+    # Topplistan läses från word.wrong_count, inte genom att gruppera svarsloggen
+    assert not [
+        sql for sql, _ in statements
+        if "FROM quiz_answer_log" in sql and "GROUP BY" in sql
+    ]
+
+
+def test_get_user_stats_leaves_commit_to_caller(app, make_user):
+    user, _ = make_user()
+    user_id = user.id
+    db.session.execute(delete(UserStats).where(UserStats.user_id == user_id))
+    db.session.commit()
+
+    assert get_user_stats(user_id).word_count == 0
+    db.session.rollback()
+
+    assert db.session.get(UserStats, user_id) is None
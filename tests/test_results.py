@@ -0,0 +1,60 @@
+from app.extensions import db
+from app.models import QuizAnswerLog, QuizResult, Word
+from app.services.results import save_quiz_answers
+
+
+WORDS = [("hund", "dog"), ("katt", "cat"), ("häst", "horse")]
+
+
+def _quiz(user):
+    result = QuizResult(user_id=user.id, correct_count=0, total_questions=0)
+    db.session.add(result)
+    db.session.flush()
+    return result
+
+
+def test_save_quiz_answers_uses_fixed_number_of_statements(make_user, statements):
+    user, wl = make_user(words=WORDS)
+    ids = [w.id for w in Word.query.filter_by(list_id=wl.id).order_by(Word.id)]
+    result = _quiz(user)
+
+    answers = [{"id": i, "correct": n % 2 == 0, "user_answer": "x"} for n, i in enumerate(ids * 20)]
+    statements.clear()
+
+    deltas = save_quiz_answers(user.id, result.id, answers)
+    db.session.commit()
+
+    writes = [(sql, many) for sql, many in statements if sql.lstrip().upper().startswith(("UPDATE", "INSERT"))]
+    # En UPDATE för ordstatistiken och en INSERT för alla 60 svar, ingen executemany
+    assert len(writes) == 2
+    assert not any(many for _, many in writes)
+    assert sum(1 for sql, _ in statements if sql.lstrip().upper().startswith("SELECT")) == 1
+
+    assert QuizAnswerLog.query.filter_by(quiz_result_id=result.id).count() == 60
+    assert sum(c + w for c, w in deltas.values()) == 60
+
+
+def test_save_quiz_answers_ignores_other_users_words(make_user):
+    user, _ = make_user("anna", WORDS)
+    other, other_list = make_user("bertil", [("sol", "sun")])
+    foreign = Word.query.filter_by(list_id=other_list.id).one()
+    result = _quiz(user)
+
+    deltas = save_quiz_answers(user.id, result.id, [{"id": foreign.id, "correct": True}])
+
+    assert deltas == {}
+    assert db.session.get(Word, foreign.id).correct_count == 0
+
+
+def test_save_quiz_answers_skips_malformed_answers(make_user):
+    user, wl = make_user(words=WORDS)
+    first = Word.query.filter_by(list_id=wl.id).order_by(Word.id).first()
+    result = _quiz(user)
+
+    # True == 1 som dict-nyckel, så ett bool-id skulle annars träffa ord 1
+    assert first.id == 1
+    answers = ["hund", None, [first.id], {"id": True, "correct": True}, {"id": str(first.id)}]
+    deltas = save_quiz_answers(user.id, result.id, answers + [{"id": first.id, "correct": False}])
+
+    assert deltas == {first.id: (0, 1)}
+    assert QuizAnswerLog.query.filter_by(quiz_result_id=result.id).count() == 1
@@ -0,0 +1,33 @@
+import json
+
+from app.extensions import db
+from app.models import Word
+from app.services.review import approve_groups, parse_group_keys, reject_groups, review_page
+
+
+def _form_values(groups):
+    # Som admin_review.html: nyckeln skickas tillbaka som JSON
+    return [json.dumps([g.norm_original, g.norm_translation]) for g in groups]
+
+
+def test_bulk_approve_matches_non_ascii_groups(make_user):
+    make_user("anna", [("Äpple", "Apple"), ("Bröd", "Bread")])
+    make_user("bertil", [("Äpple", "apple")])
+
+    groups, _ = review_page()
+    approved = approve_groups(parse_group_keys(_form_values(groups)))
+    db.session.commit()
+
+    assert approved == 3
+    assert Word.query.filter_by(is_global=False).count() == 0
+
+
+def test_bulk_reject_matches_non_ascii_groups(make_user):
+    make_user("anna", [("Öl", "Beer")])
+
+    groups, _ = review_page()
+    removed, _, _ = reject_groups(parse_group_keys(_form_values(groups)))
+    db.session.commit()
+
+    assert removed == 1
+    assert Word.query.count() == 0
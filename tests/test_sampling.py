@@ -0,0 +1,52 @@
+from app.extensions import db
+from app.models import Word
+from app.services.deletion import delete_words
+from app.services.rollups import bump_user_stats, current_data_version
+from app.services.sampling import get_word_sampler, record_word_results
+
+
+WORDS = [("hund", "dog"), ("katt", "cat"), ("häst", "horse")]
+
+
+def test_sampler_follows_writes_from_other_workers(make_user):
+    user, wl = make_user(words=WORDS)
+    assert len(get_word_sampler(user.id)) == 3
+
+    # Borttaget i en annan worker: bara versionen når den här processen
+    word_id = Word.query.filter_by(list_id=wl.id, original="katt").one().id
+    delete_words([word_id])
+    bump_user_stats(user.id, word_count=-1)
+    db.session.commit()
+
+    sampler = get_word_sampler(user.id)
+    assert len(sampler) == 2
+    assert word_id not in sampler.sample(50)
+
+
+def test_record_word_results_updates_cached_samplers(make_user):
+    user, wl = make_user(words=WORDS)
+    word = Word.query.filter_by(list_id=wl.id, original="hund").one()
+    everything = get_word_sampler(user.id)
+    one_list = get_word_sampler(user.id, [wl.id])
+
+    bump_user_stats(user.id)
+    db.session.commit()
+    record_word_results(user.id, {word.id: (0, 5)}, current_data_version(user.id))
+
+    # Båda listvalen finns kvar och har fått de nya räknarna
+    assert get_word_sampler(user.id) is everything
+    assert get_word_sampler(user.id, [wl.id]) is one_list
+    assert everything.wrong[everything.position[word.id]] == 5
+
+
+def test_record_word_results_drops_samplers_after_foreign_write(make_user):
+    user, _ = make_user(words=WORDS)
+    sampler = get_word_sampler(user.id)
+
+    # Två skrivningar sedan samplern byggdes: en okänd skrivning kom emellan
+    bump_user_stats(user.id)
+    bump_user_stats(user.id)
+    db.session.commit()
+    record_word_results(user.id, {}, current_data_version(user.id))
+
+    assert get_word_sampler(user.id) is not sampler
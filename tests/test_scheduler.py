@@ -0,0 +1,90 @@
+import json
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Word
+from app.services.scheduler import DEFAULT_EASE, MIN_EASE, due_word_ids, schedule_updates, sm2
+
+
+NOW = datetime(2026, 1, 10, 12, 0)
+
+
+def test_correct_answers_grow_interval_by_ease():
+    state = (0, 0, DEFAULT_EASE)
+    intervals = []
+    for _ in range(4):
+        state = sm2(*state, quality=4)
+        intervals.append(state[1])
+
+    # Kvalitet 4 lämnar ease orörd: 1, 6 och sedan interval * ease
+    assert intervals == [1, 6, 15, 37.5]
+    assert state == (4, 37.5, DEFAULT_EASE)
+
+
+def test_wrong_answer_resets_repetitions_and_lowers_ease():
+    assert sm2(3, 15, 2.5, quality=1) == (0, 1, 1.96)
+
+    state = (3, 15, 2.5)
+    for _ in range(5):
+        state = sm2(*state, quality=1)
+    assert state == (0, 1, MIN_EASE)
+
+
+def test_schedule_updates_applies_answers_in_order():
+    states = {1: (2, 6, 2.5), 2: (None, None, None)}
+    outcomes = {1: [False, True], 2: [True], 3: [True]}
+
+    rows = {r["id"]: r for r in schedule_updates(states, outcomes, NOW)}
+
+    # Ord 3 saknar state (inte användarens) och hoppas över
+    assert set(rows) == {1, 2}
+    assert (rows[1]["repetitions"], rows[1]["interval_days"], rows[1]["ease"]) == (1, 1, 1.96)
+    assert rows[1]["next_due"] == NOW + timedelta(days=1)
+    assert (rows[2]["repetitions"], rows[2]["interval_days"]) == (1, 1)
+
+
+def _set_due(wl, due):
+    words = Word.query.filter_by(list_id=wl.id).order_by(Word.id).all()
+    for word, next_due in zip(words, due):
+        word.next_due = next_due
+    db.session.commit()
+    return [w.id for w in words]
+
+
+def test_due_word_ids_returns_only_due_words_oldest_first(make_user):
+    user, wl = make_user("anna", [("a", "a"), ("b", "b"), ("c", "c"), ("d", "d")])
+    other, other_list = make_user("bertil", [("e", "e")])
+    ids = _set_due(wl, [NOW - timedelta(days=1), NOW + timedelta(days=1), None, NOW - timedelta(days=3)])
+    _set_due(other_list, [NOW - timedelta(days=5)])
+
+    assert due_word_ids(user.id, now=NOW) == [ids[3], ids[0]]
+    assert due_word_ids(user.id, now=NOW, limit=1) == [ids[3]]
+    assert due_word_ids(user.id, [other_list.id], now=NOW) == []
+
+
+def test_due_quiz_redirects_when_nothing_is_due(app, make_user, login):
+    user, wl = make_user(words=[("hund", "dog")])
+    _set_due(wl, [datetime.utcnow() + timedelta(days=2)])
+    client = app.test_client()
+    login(client, user)
+
+    response = client.get(f"/quiz/take?lists={wl.id}&mode=due")
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/quiz/")
+
+
+@pytest.mark.parametrize("lists", ["all", None])
+def test_due_quiz_asks_only_due_words(app, make_user, login, lists):
+    user, wl = make_user(words=[("hund", "dog"), ("katt", "cat")])
+    ids = _set_due(wl, [datetime.utcnow() - timedelta(days=1), datetime.utcnow() + timedelta(days=1)])
+    client = app.test_client()
+    login(client, user)
+
+    response = client.get(f"/quiz/take?lists={lists or wl.id}&mode=due&num_words=5")
+
+    quiz_data = json.loads(re.search(r"const QUIZ_DATA = (.*);", response.get_data(as_text=True)).group(1))
+    assert [q["id"] for q in quiz_data] == [ids[0]]
@@ -0,0 +1,75 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models import Word
+from app.services.search import _pg_search, search_words
+
+
+WORDS = [("hus", "house"), ("båthus", "boathouse"), ("café", "coffee shop"), ("100%", "helt")]
+
+
+def _originals(user_id, q, **kwargs):
+    rows, _ = search_words(user_id, q, **kwargs)
+    return [r.original for r in rows]
+
+
+def _fts_ids(match):
+    return [r[0] for r in db.session.execute(
+        text("SELECT rowid FROM word_fts WHERE word_fts MATCH :q ORDER BY rowid"), {"q": match}
+    )]
+
+
+def test_triggers_keep_fts_index_in_sync(make_user):
+    _, wl = make_user(words=[("hund", "dog")])
+    word = Word.query.filter_by(list_id=wl.id).one()
+    assert _fts_ids('"hund"') == [word.id]
+
+    word.original = "valp"
+    db.session.commit()
+    assert _fts_ids('"hund"') == []
+    assert _fts_ids('"valp"') == [word.id]
+
+    db.session.delete(word)
+    db.session.commit()
+    assert _fts_ids('"valp"') == []
+
+
+def test_search_ranks_exact_then_prefix_then_substring(make_user):
+    user, _ = make_user(words=WORDS)
+
+    assert _originals(user.id, "hus") == ["hus", "båthus"]
+    # "ouse" står mitt i ord: bara delsträngsvägen hittar dem
+    assert _originals(user.id, "ouse") == ["hus", "båthus"]
+
+
+def test_search_ignores_accents_in_prefixes(make_user):
+    user, _ = make_user(words=WORDS)
+
+    assert _originals(user.id, "cafe") == ["café"]
+
+
+def test_search_treats_like_wildcards_literally(make_user):
+    user, _ = make_user(words=WORDS)
+
+    assert _originals(user.id, "%") == ["100%"]
+    assert _originals(user.id, "_") == []
+
+
+def test_search_is_scoped_to_user_and_pages(make_user):
+    user, _ = make_user("anna", WORDS)
+    other, _ = make_user("bertil", [("husvagn", "caravan")])
+
+    assert _originals(other.id, "hus") == ["husvagn"]
+
+    rows, has_more = search_words(user.id, "hus", limit=1)
+    assert [r.original for r in rows] == ["hus"] and has_more
+    rows, has_more = search_words(user.id, "hus", limit=1, offset=1)
+    assert [r.original for r in rows] == ["båthus"] and not has_more
+
+
+def test_pg_prefix_rank_escapes_wildcards():
+    compiled = _pg_search(1, "a_b%").compile(dialect=postgresql.dialect())
+
+    assert "a\\_b\\%%" in compiled.params.values()
+    assert "%a\\_b\\%%" in compiled.params.values()
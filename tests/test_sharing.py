@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import ListShare, UserStats, Word, WordList
+from app.services.rollups import get_user_stats
+from app.services.scheduler import DEFAULT_EASE, due_word_ids
+from app.services.sharing import share_list
+
+
+WORDS = [("hund", "dog"), ("katt", "cat")]
+
+
+def _shared(make_user):
+    owner, wl = make_user("anna", WORDS)
+    recipient, _ = make_user("bertil")
+    for user in (owner, recipient):
+        get_user_stats(user.id)
+    share, error = share_list(wl, "bertil")
+    db.session.commit()
+    assert error is None
+    return owner, recipient, wl, share
+
+
+def test_recipient_can_read_but_not_change_shared_list(app, make_user, login):
+    owner, recipient, wl, share = _shared(make_user)
+    word = Word.query.filter_by(list_id=wl.id).first()
+    client = app.test_client()
+    login(client, recipient)
+
+    response = client.get(f"/lists/shared/{share.id}")
+    assert response.status_code == 200
+    assert "hund" in response.get_data(as_text=True)
+
+    # Ägarens egna vyer och skrivvägar är stängda för mottagaren
+    assert client.get(f"/lists/{wl.id}").status_code == 302
+    assert client.get(f"/lists/api/{wl.id}/words").status_code == 403
+    client.post(f"/lists/{wl.id}/add", data={"original": "häst", "translation": "horse"})
+    client.post(f"/lists/word/{word.id}/edit", data={"original": "x", "translation": "y"})
+    client.get(f"/lists/word/{word.id}/delete")
+    client.post(f"/lists/{wl.id}/delete")
+
+    db.session.expire_all()
+    assert sorted((w.original, w.translation) for w in Word.query.filter_by(list_id=wl.id)) == [
+        ("hund", "dog"), ("katt", "cat"),
+    ]
+
+
+def test_other_users_cannot_open_a_share(app, make_user, login):
+    _, _, _, share = _shared(make_user)
+    stranger, _ = make_user("cecilia")
+    client = app.test_client()
+    login(client, stranger)
+
+    assert client.get(f"/lists/shared/{share.id}").status_code == 302
+    client.post(f"/lists/shared/{share.id}/copy")
+    assert WordList.query.filter_by(user_id=stranger.id).count() == 1
+
+
+def test_copy_resets_counters_and_schedule(app, make_user, login):
+    owner, recipient, wl, share = _shared(make_user)
+    for word in Word.query.filter_by(list_id=wl.id):
+        word.correct_count, word.wrong_count = 5, 3
+        word.last_wrong = datetime(2026, 1, 1)
+        word.repetitions, word.interval_days, word.ease = 4, 30, 1.8
+        word.next_due = datetime.utcnow() + timedelta(days=30)
+    db.session.commit()
+
+    client = app.test_client()
+    login(client, recipient)
+    client.post(f"/lists/shared/{share.id}/copy")
+
+    db.session.expire_all()
+    copy = WordList.query.filter(WordList.user_id == recipient.id, WordList.id != wl.id).filter_by(
+        name=wl.name
+    ).one()
+    words = Word.query.filter_by(list_id=copy.id).order_by(Word.id).all()
+    assert [(w.original, w.translation) for w in words] == WORDS
+    assert all(
+        (w.correct_count, w.wrong_count, w.last_wrong, w.repetitions, w.interval_days, w.ease, w.is_global)
+        == (0, 0, None, 0, 0, DEFAULT_EASE, False)
+        for w in words
+    )
+    # Kopian går direkt att repetera
+    assert sorted(due_word_ids(recipient.id, [copy.id])) == [w.id for w in words]
+
+    assert copy.word_count == 2
+    stats = db.session.get(UserStats, recipient.id)
+    assert (stats.list_count, stats.word_count) == (2, 2)
+    assert ListShare.query.count() == 0
+
+
+def test_deleting_shared_list_removes_the_share(app, make_user, login):
+    owner, recipient, wl, share = _shared(make_user)
+    share_id = share.id
+    client = app.test_client()
+    login(client, owner)
+
+    client.post(f"/lists/{wl.id}/delete")
+
+    assert ListShare.query.count() == 0
+    assert WordList.query.filter_by(user_id=owner.id).count() == 0
+
+    login(client, recipient)
+    assert client.get(f"/lists/shared/{share_id}").status_code == 302
@@ -0,0 +1,46 @@
+from datetime import date, datetime, timedelta
+
+from app.extensions import db
+from app.services.analytics import get_daily_streaks, get_quiz_history
+from app.services.rollups import record_daily_answers
+
+
+def _days(user, *entries):
+    for day, correct, wrong in entries:
+        record_daily_answers(user.id, correct, wrong, day=day)
+    db.session.commit()
+
+
+def test_quiz_history_reads_daily_rollup(make_user):
+    user, _ = make_user()
+    _days(user, (date(2026, 3, 1), 3, 1), (date(2026, 3, 1), 1, 0), (date(2026, 3, 3), 0, 2))
+
+    assert get_quiz_history(user.id) == [
+        {"date": "2026-03-01", "correct": 4, "wrong": 1, "accuracy": 80.0},
+        {"date": "2026-03-03", "correct": 0, "wrong": 2, "accuracy": 0.0},
+    ]
+    assert [d["date"] for d in get_quiz_history(user.id, start=date(2026, 3, 2))] == ["2026-03-03"]
+
+
+def test_daily_streaks_count_only_when_practiced_today(make_user):
+    user, _ = make_user()
+    today = date(2026, 3, 10)
+    _days(
+        user,
+        *[(date(2026, 3, 1) + timedelta(days=n), 1, 0) for n in range(4)],
+        *[(today - timedelta(days=n), 1, 0) for n in range(2)],
+    )
+
+    assert get_daily_streaks(user.id, today) == {"current": 2, "longest": 4}
+    assert get_daily_streaks(user.id, today + timedelta(days=1)) == {"current": 0, "longest": 4}
+
+
+def test_streak_and_daily_endpoints(app, make_user, login):
+    user, _ = make_user()
+    _days(user, (datetime.utcnow().date(), 2, 1))
+    client = app.test_client()
+    login(client, user)
+
+    assert client.get("/stats/api/streaks").get_json() == {"current": 1, "longest": 1}
+    days = client.get("/stats/api/daily?days=7").get_json()["days"]
+    assert [(d["correct"], d["wrong"]) for d in days] == [(2, 1)]
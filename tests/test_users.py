@@ -0,0 +1,29 @@
+from app.extensions import db
+from app.models import User, UserStats
+from app.services.listing import user_page
+
+
+def test_registration_creates_stats_row(app):
+    client = app.test_client()
+    response = client.post("/auth/register", data={
+        "username": "cecilia", "email": "cecilia@example.com", "password": "hemligt",
+    })
+
+    assert response.status_code == 302
+    user = User.query.filter_by(username="cecilia").one()
+    stats = db.session.get(UserStats, user.id)
+    assert (stats.word_count, stats.list_count, stats.quiz_count) == (0, 0, 0)
+
+
+def test_user_page_sorts_on_word_count(make_user):
+    from app.services.rollups import get_user_stats
+
+    for name, words in [("anna", 1), ("bertil", 3), ("cecilia", 2)]:
+        user, _ = make_user(name, [(f"o{i}", f"t{i}") for i in range(words)])
+        get_user_stats(user.id)
+
+    rows, cursor = user_page(sort="words", limit=2)
+
+    assert [r.username for r in rows] == ["bertil", "cecilia"]
+    rows, cursor = user_page(sort="words", after=cursor, limit=2)
+    assert [r.username for r in rows] == ["anna"] and cursor is None